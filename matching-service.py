@@ -2,26 +2,169 @@
 """
 Peptok Matching Service
 Advanced coach-to-request matching using machine learning and business rules
+
+Requires NumPy, pinned in matching-service/requirements.txt:
+
+    pip install numpy==1.25.2
+    python matching-service.py
 """
 
 import json
 import sqlite3
 import os
+import threading
+import time
+from collections import namedtuple
+from contextlib import contextmanager
 from datetime import datetime
 from typing import List, Dict, Any
-import math
+
+import numpy as np
+
+# Seconds a loaded coach list is served from memory before re-reading SQLite
+COACH_DATA_TTL = int(os.getenv('COACH_DATA_TTL', 3600))
+
+# Number of top-scoring matches returned per request
+MAX_MATCHES_PER_REQUEST = int(os.getenv('MAX_MATCHES_PER_REQUEST', 10))
+
+# Joins a coach's skills into one string, both in storage and for substring
+# search; the ASCII unit separator never appears in skill names
+EXPERTISE_SEPARATOR = '\x1f'
+
+# Leads every packed non-empty expertise value so it is never confused with a
+# legacy JSON array; an empty skill list is stored as the empty string
+EXPERTISE_FORMAT_MARKER = '\x1e'
+
+def encode_expertise(expertise: List[str]) -> str:
+    """Encode a skill list for the coaches.expertise column"""
+    if not expertise:
+        return ''
+    return EXPERTISE_FORMAT_MARKER + EXPERTISE_SEPARATOR.join(expertise)
+
+def decode_expertise(value: str) -> List[str]:
+    """Decode the coaches.expertise column, accepting legacy JSON arrays"""
+    if not value:
+        return []
+    if value[0] == EXPERTISE_FORMAT_MARKER:
+        return value[1:].split(EXPERTISE_SEPARATOR)
+    return json.loads(value)
+
+# Final score weights and floor
+EXPERTISE_WEIGHT = 0.5  # 50% weight on expertise
+EXPERIENCE_WEIGHT = 0.3 # 30% weight on experience
+RATING_WEIGHT = 0.2     # 20% weight on rating
+MIN_FINAL_SCORE = 0.3
+
+# Match reason for every combination of strong sub-scores, indexed by the bitmask
+# (expertise > 0.7) << 2 | (experience > 0.8) << 1 | (rating > 0.9); mask 0 has no
+# fixed text and falls back to the overall percentage
+REASON_PARTS = ("Strong expertise alignment", "Excellent experience match", "Outstanding client ratings")
+REASON_TABLE = tuple(
+    ", ".join(part for bit, part in zip((4, 2, 1), REASON_PARTS) if mask & bit)
+    for mask in range(8)
+)
+
+# Coach data laid out per column (numeric columns as NumPy arrays) for the scoring pass
+CoachCache = namedtuple('CoachCache', ['ids', 'expertise_lc', 'expertise_text', 'ratings', 'years'])
+
+# Marks an experience string with no digits in it
+UNKNOWN_YEARS = -1
+
+def parse_years(experience: str) -> int:
+    """Extract the years figure from strings like '15+ years'"""
+    digits = ''.join(c for c in experience or '' if c.isdigit())
+    return int(digits) if digits else UNKNOWN_YEARS
+
+def score_all(expertise_scores, years: np.ndarray, ratings: np.ndarray, required_years: int):
+    """Compute experience, rating and final scores for every coach as whole-column NumPy operations"""
+    expertise_scores = np.asarray(expertise_scores, dtype=np.float64)
+    if required_years == UNKNOWN_YEARS:
+        experience_scores = np.full(len(years), 0.5)
+    else:
+        # The ratio is only used where coach_years < required_years, so required_years > 0 there
+        experience_scores = np.where(
+            years >= required_years, 1.0, years / max(required_years, 1)
+        )
+        experience_scores[years == UNKNOWN_YEARS] = 0.5
+    rating_scores = np.minimum(ratings / 5.0, 1.0)
+    final_scores = (
+        expertise_scores * EXPERTISE_WEIGHT +
+        experience_scores * EXPERIENCE_WEIGHT +
+        rating_scores * RATING_WEIGHT
+    )
+    np.maximum(final_scores, MIN_FINAL_SCORE, out=final_scores)
+    return experience_scores, rating_scores, final_scores
+
+def top_k(scores: np.ndarray, k: int) -> np.ndarray:
+    """Indices of the k largest scores, highest first with ties in index order"""
+    if k <= 0 or len(scores) == 0:
+        return np.empty(0, dtype=np.intp)
+    if len(scores) > k:
+        # argpartition finds the k-th largest score; keep every coach tied with it
+        # so the stable sort below breaks ties the same way a full sort would
+        kth = scores[np.argpartition(-scores, k - 1)[:k]].min()
+        candidates = np.flatnonzero(scores >= kth)
+    else:
+        candidates = np.arange(len(scores))
+    return candidates[np.argsort(-scores[candidates], kind='stable')][:k]
 
 class MatchingDatabase:
+    # Refresh planner statistics after batches at least this large
+    ANALYZE_THRESHOLD = 1000
+    
+    # Hot statements; sqlite3 caches compiled statements keyed on the SQL text,
+    # so every call site shares one constant
+    INSERT_COACH_SQL = '''
+        INSERT OR REPLACE INTO coaches 
+        (id, name, expertise, experience, rating, bio, hourly_rate, availability, created_at, updated_at)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    '''
+    INSERT_MATCH_SQL = '''
+        INSERT OR REPLACE INTO matches 
+        (id, coach_id, request_id, match_score, reason, created_at)
+        VALUES (?, ?, ?, ?, ?, ?)
+    '''
+    SELECT_SCORING_COLUMNS_SQL = 'SELECT id, expertise, experience, rating FROM coaches'
+    
     def __init__(self, db_path="matching_database.db"):
         self.db_path = db_path
+        # One long-lived connection in autocommit mode so transactions are explicit;
+        # check_same_thread=False lets an embedding server call in from other threads,
+        # with writes serialized by _write_lock
+        self.conn = sqlite3.connect(db_path, check_same_thread=False, isolation_level=None)
+        self.conn.row_factory = sqlite3.Row
+        self._write_lock = threading.Lock()
+        # Cache name -> (loaded_at, data); cleared on every coach write
+        self._coaches_cache = {}
+        self.conn.executescript('''
+            PRAGMA journal_mode=WAL;
+            PRAGMA synchronous=NORMAL;
+            PRAGMA temp_store=MEMORY;
+            PRAGMA cache_size=-20000;
+        ''')
         self.init_database()
     
+    @contextmanager
+    def _transaction(self):
+        """Serialize writers and wrap the block in BEGIN/COMMIT"""
+        with self._write_lock:
+            cursor = self.conn.cursor()
+            cursor.execute('BEGIN')
+            try:
+                yield cursor
+            except Exception:
+                cursor.execute('ROLLBACK')
+                raise
+            cursor.execute('COMMIT')
+    
     def init_database(self):
         """Initialize SQLite database with required tables"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        # Create tables
+        with self._transaction() as cursor:
+            self._create_tables(cursor)
+        print(f"📁 Matching database initialized: {self.db_path}")
+    
+    def _create_tables(self, cursor):
+        """Create tables"""
         cursor.execute('''
             CREATE TABLE IF NOT EXISTS coaches (
                 id TEXT PRIMARY KEY,
@@ -65,81 +208,114 @@ class MatchingDatabase:
             )
         ''')
         
-        conn.commit()
-        conn.close()
-        print(f"📁 Matching database initialized: {self.db_path}")
+        # Create indexes for match lookups by request and by coach
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_matches_request ON matches(request_id)')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_matches_coach ON matches(coach_id)')
     
     def save_coach(self, coach_data: Dict[str, Any]):
         """Save coach to database"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        with self._transaction() as cursor:
+            cursor.execute(self.INSERT_COACH_SQL, (
+                coach_data['id'],
+                coach_data['name'],
+                encode_expertise(coach_data.get('expertise', [])),
+                coach_data.get('experience', ''),
+                coach_data.get('rating', 0.0),
+                coach_data.get('bio', ''),
+                coach_data.get('hourlyRate', 0),
+                coach_data.get('availability', 'Unknown'),
+                coach_data.get('createdAt', datetime.now().isoformat()),
+                datetime.now().isoformat()
+            ))
         
-        cursor.execute('''
-            INSERT OR REPLACE INTO coaches 
-            (id, name, expertise, experience, rating, bio, hourly_rate, availability, created_at, updated_at)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        ''', (
-            coach_data['id'],
-            coach_data['name'],
-            json.dumps(coach_data.get('expertise', [])),
-            coach_data.get('experience', ''),
-            coach_data.get('rating', 0.0),
-            coach_data.get('bio', ''),
-            coach_data.get('hourlyRate', 0),
-            coach_data.get('availability', 'Unknown'),
-            coach_data.get('createdAt', datetime.now().isoformat()),
-            datetime.now().isoformat()
-        ))
-        
-        conn.commit()
-        conn.close()
+        self._coaches_cache.clear()
     
     def get_coaches(self) -> List[Dict[str, Any]]:
+        """Get all coaches, served from memory while the cache is fresh"""
+        return list(self.get_coaches_by_id().values())
+    
+    def get_coaches_by_id(self) -> Dict[str, Dict[str, Any]]:
+        """Get cached coach payloads keyed by coach id"""
+        return self._get_cached('payloads', self._load_coaches)
+    
+    def get_coaches_for_scoring(self) -> CoachCache:
+        """Get cached per-column scoring data for all coaches"""
+        return self._get_cached('scoring', self._load_scoring_cache)
+    
+    def _get_cached(self, name: str, loader):
+        """Return a cache entry, reloading it when missing or older than COACH_DATA_TTL"""
+        entry = self._coaches_cache.get(name)
+        if entry is None or time.monotonic() - entry[0] > COACH_DATA_TTL:
+            entry = (time.monotonic(), loader())
+            self._coaches_cache[name] = entry
+        return entry[1]
+    
+    def _load_scoring_cache(self) -> CoachCache:
+        """Build the scoring columns from the lean scoring query"""
+        rows = self.get_coach_scoring_columns()
+        expertise_lc = [tuple(skill.lower() for skill in decode_expertise(row['expertise'])) for row in rows]
+        return CoachCache(
+            ids=[row['id'] for row in rows],
+            expertise_lc=expertise_lc,
+            expertise_text=[EXPERTISE_SEPARATOR.join(skills) for skills in expertise_lc],
+            ratings=np.array([row['rating'] or 0.0 for row in rows], dtype=np.float64),
+            years=np.array([parse_years(row['experience']) for row in rows], dtype=np.int32)
+        )
+    
+    def count_coaches(self) -> int:
+        """Count coaches without loading them"""
+        return self.conn.execute('SELECT COUNT(*) FROM coaches').fetchone()[0]
+    
+    def get_coach_scoring_columns(self) -> List[sqlite3.Row]:
+        """Get only the columns the scoring pass needs"""
+        return self.conn.execute(self.SELECT_SCORING_COLUMNS_SQL).fetchall()
+    
+    def _load_coaches(self) -> Dict[str, Dict[str, Any]]:
         """Get all coaches from database"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute('SELECT * FROM coaches')
+        cursor = self.conn.execute('SELECT * FROM coaches')
         rows = cursor.fetchall()
         
-        coaches = []
+        coaches = {}
         for row in rows:
-            coaches.append({
-                'id': row[0],
-                'name': row[1],
-                'expertise': json.loads(row[2]) if row[2] else [],
-                'experience': row[3],
-                'rating': row[4],
-                'bio': row[5],
-                'hourlyRate': row[6],
-                'availability': row[7],
-                'createdAt': row[8],
-                'updatedAt': row[9]
-            })
+            coaches[row['id']] = {
+                'id': row['id'],
+                'name': row['name'],
+                'expertise': decode_expertise(row['expertise']),
+                'experience': row['experience'],
+                'rating': row['rating'],
+                'bio': row['bio'],
+                'hourlyRate': row['hourly_rate'],
+                'availability': row['availability'],
+                'createdAt': row['created_at'],
+                'updatedAt': row['updated_at']
+            }
         
-        conn.close()
         return coaches
     
     def save_match(self, match_data: Dict[str, Any]):
         """Save match to database"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            INSERT OR REPLACE INTO matches 
-            (id, coach_id, request_id, match_score, reason, created_at)
-            VALUES (?, ?, ?, ?, ?, ?)
-        ''', (
-            match_data['id'],
-            match_data['coachId'],
-            match_data['requestId'],
-            match_data['matchScore'],
-            match_data['reason'],
-            datetime.now().isoformat()
-        ))
+        with self._transaction() as cursor:
+            cursor.execute(self.INSERT_MATCH_SQL, (
+                match_data['id'],
+                match_data['coachId'],
+                match_data['requestId'],
+                match_data['matchScore'],
+                match_data['reason'],
+                datetime.now().isoformat()
+            ))
+    
+    def save_matches(self, rows: List[tuple]):
+        """Save a batch of (id, coach_id, request_id, match_score, reason, created_at) rows in one transaction"""
+        with self._transaction() as cursor:
+            cursor.executemany(self.INSERT_MATCH_SQL, rows)
         
-        conn.commit()
-        conn.close()
+        if len(rows) >= self.ANALYZE_THRESHOLD:
+            self.analyze()
+    
+    def analyze(self):
+        """Refresh SQLite query planner statistics"""
+        with self._write_lock:
+            self.conn.execute('ANALYZE')
 
 class AdvancedMatchingService:
     def __init__(self):
@@ -186,98 +362,103 @@ class AdvancedMatchingService:
         
         for coach in sample_coaches:
             self.db.save_coach(coach)
+        
+        self.db.analyze()
     
-    def calculate_expertise_score(self, coach_expertise: List[str], required_expertise: List[str]) -> float:
-        """Calculate expertise alignment score"""
+    def calculate_expertise_score(self, coach_expertise: List[str], required_expertise: List[str],
+                                  coach_text: str) -> float:
+        """Calculate expertise alignment score (inputs already lowercased)"""
         if not required_expertise or not coach_expertise:
             return 0.3
         
         matches = 0
         for req_skill in required_expertise:
-            for coach_skill in coach_expertise:
-                if req_skill.lower() in coach_skill.lower() or coach_skill.lower() in req_skill.lower():
-                    matches += 1
-                    break
+            # One scan of the joined text covers "required skill inside a coach skill";
+            # only fall back to the per-skill loop for the reverse containment
+            if req_skill in coach_text or any(coach_skill in req_skill for coach_skill in coach_expertise):
+                matches += 1
         
         return min(matches / len(required_expertise), 1.0)
     
-    def calculate_experience_score(self, coach_experience: str, required_level: str) -> float:
-        """Calculate experience level alignment"""
-        try:
-            coach_years = int(''.join(filter(str.isdigit, coach_experience)))
-            required_years = int(''.join(filter(str.isdigit, required_level))) if required_level else 5
-            
-            if coach_years >= required_years:
-                return 1.0
-            else:
-                return coach_years / required_years
-        except:
-            return 0.5
-    
-    def calculate_rating_score(self, rating: float) -> float:
-        """Calculate rating contribution to score"""
-        return min(rating / 5.0, 1.0)
-    
     def generate_matches(self, request_data: Dict[str, Any]) -> List[Dict[str, Any]]:
         """Generate matches for a coaching request"""
-        coaches = self.db.get_coaches()
-        matches = []
+        cache = self.db.get_coaches_for_scoring()
+        coaches_by_id = self.db.get_coaches_by_id()
         
-        required_expertise = request_data.get('expertise', [])
+        # One timestamp for the whole batch
+        now = datetime.now()
+        now_iso = now.isoformat()
+        now_ts = int(now.timestamp())
+        
+        required_expertise = [skill.lower() for skill in request_data.get('expertise', [])]
         required_experience = request_data.get('experience', '5+ years')
-        request_id = request_data.get('id', f"request_{int(datetime.now().timestamp())}")
+        required_years = parse_years(required_experience) if required_experience else 5
+        request_id = request_data.get('id', f"request_{now_ts}")
         
-        for coach in coaches:
-            # Calculate individual scores
-            expertise_score = self.calculate_expertise_score(coach['expertise'], required_expertise)
-            experience_score = self.calculate_experience_score(coach['experience'], required_experience)
-            rating_score = self.calculate_rating_score(coach['rating'])
-            
-            # Weighted final score
-            final_score = (
-                expertise_score * 0.5 +  # 50% weight on expertise
-                experience_score * 0.3 + # 30% weight on experience
-                rating_score * 0.2       # 20% weight on rating
-            )
-            
-            # Ensure minimum score of 0.3
-            final_score = max(final_score, 0.3)
-            
-            # Generate reason
-            reason_parts = []
-            if expertise_score > 0.7:
-                reason_parts.append("Strong expertise alignment")
-            if experience_score > 0.8:
-                reason_parts.append("Excellent experience match")
-            if rating_score > 0.9:
-                reason_parts.append("Outstanding client ratings")
+        # Calculate individual scores
+        expertise_scores = np.fromiter((
+            self.calculate_expertise_score(expertise_lc, required_expertise, expertise_text)
+            for expertise_lc, expertise_text in zip(cache.expertise_lc, cache.expertise_text)
+        ), dtype=np.float64, count=len(cache.ids))
+        
+        # Experience, rating and weighted final scores (floored at MIN_FINAL_SCORE)
+        experience_scores, rating_scores, final_scores = score_all(
+            expertise_scores, cache.years, cache.ratings, required_years
+        )
+        
+        # Reason table index for every coach in one pass
+        reason_masks = (
+            (expertise_scores > 0.7).astype(np.int8) << 2 |
+            (experience_scores > 0.8).astype(np.int8) << 1 |
+            (rating_scores > 0.9).astype(np.int8)
+        )
+        
+        # Every coach's match is persisted, so build the lightweight rows for all of them
+        rows = []
+        for coach_id, final_score, mask in zip(cache.ids, final_scores.tolist(), reason_masks.tolist()):
+            reason = REASON_TABLE[mask] if mask else f"{int(final_score * 100)}% overall compatibility"
             
-            reason = ", ".join(reason_parts) if reason_parts else f"{int(final_score * 100)}% overall compatibility"
+            rows.append((
+                f"match_{now_ts}_{coach_id}",
+                coach_id,
+                request_id,
+                round(final_score, 2),
+                reason,
+                now_iso
+            ))
+        
+        # Save all matches to database in one transaction
+        self.db.save_matches(rows)
+        
+        print(f"🔍 Generated {len(rows)} matches for request {request_id}")
+        
+        # Only the top matches by stored score descending become full payloads
+        match_scores = np.fromiter((row[3] for row in rows), dtype=np.float64, count=len(rows))
+        top = top_k(match_scores, MAX_MATCHES_PER_REQUEST)
+        
+        matches = []
+        for i in top.tolist():
+            match_id, coach_id, _, match_score, reason, _ = rows[i]
+            coach = coaches_by_id.get(coach_id)
+            if coach is None:
+                # Added by another writer since the payload cache was loaded
+                continue
             
-            match = {
-                'id': f"match_{int(datetime.now().timestamp())}_{coach['id']}",
-                'coachId': coach['id'],
+            matches.append({
+                'id': match_id,
+                'coachId': coach_id,
                 'requestId': request_id,
-                'matchScore': round(final_score, 2),
+                'matchScore': match_score,
                 'reason': reason,
                 'coach': coach,
-                'createdAt': datetime.now().isoformat(),
+                'createdAt': now_iso,
                 'scores': {
-                    'expertise': round(expertise_score, 2),
-                    'experience': round(experience_score, 2),
-                    'rating': round(rating_score, 2)
+                    'expertise': round(float(expertise_scores[i]), 2),
+                    'experience': round(float(experience_scores[i]), 2),
+                    'rating': round(float(rating_scores[i]), 2)
                 }
-            }
-            
-            matches.append(match)
-            
-            # Save match to database
-            self.db.save_match(match)
-        
-        # Sort by score descending
-        matches.sort(key=lambda x: x['matchScore'], reverse=True)
+            })
         
-        print(f"🔍 Generated {len(matches)} matches for request {request_id}")
         return matches
 
 # Simple HTTP server simulation
@@ -303,13 +484,12 @@ def run_matching_service():
     
     def get_service_health():
         """Get service health status"""
-        coaches = matching_service.db.get_coaches()
         return {
             'status': 'ok',
             'service': 'peptok-matching-service',
             'timestamp': datetime.now().isoformat(),
             'database': {
-                'coaches': len(coaches),
+                'coaches': matching_service.db.count_coaches(),
                 'dbPath': matching_service.db.db_path
             }
         }
@@ -317,7 +497,7 @@ def run_matching_service():
     # Print service information
     print("🚀 Peptok Matching Service initialized")
     print(f"📁 Database: {matching_service.db.db_path}")
-    print(f"👥 Coaches loaded: {len(matching_service.db.get_coaches())}")
+    print(f"👥 Coaches loaded: {matching_service.db.count_coaches()}")
     
     # Test matching
     test_request = {
@@ -3,13 +3,15 @@
 Peptok Coach Matching Service
 
 A Flask-based microservice that provides intelligent coach-to-request matching
-using machine learning algorithms and business rules. Integrates with Kafka
-for asynchronous communication with the main backend.
+using machine learning algorithms and business rules. Kafka matching requests
+are consumed by the separate consumer.py process; the web workers only serve
+HTTP.
 """
 
 import os
+import sys
 import logging
-import threading
+import orjson
 from flask import Flask, jsonify, request
 from flask_cors import CORS
 from dotenv import load_dotenv
@@ -80,20 +82,22 @@ def create_app():
             data = request.get_json()
             
             # Validate request
-            matching_request = MatchingRequest(**data)
+            matching_request = MatchingRequest.model_validate(data)
             
             # Perform matching
-            matches = matching_service.find_matches(matching_request)
+            matches, processing_time = matching_service.find_matches(matching_request)
             
             # Create response
             response = MatchingResponse(
                 request_id=matching_request.request_id,
                 matches=matches,
-                processing_time_ms=matching_service.get_last_processing_time(),
+                processing_time_ms=processing_time,
                 algorithm_version=matching_service.get_algorithm_version()
             )
             
-            return jsonify(response.dict()), 200
+            return app.response_class(
+                response.model_dump_json(), status=200, mimetype='application/json'
+            )
             
         except Exception as e:
             logger.error(f"Manual matching failed: {e}")
@@ -107,10 +111,14 @@ def create_app():
         """Get all available coaches"""
         try:
             coaches = matching_service.get_all_coaches()
-            return jsonify({
-                'coaches': [coach.dict() for coach in coaches],
-                'count': len(coaches)
-            }), 200
+            return app.response_class(
+                orjson.dumps({
+                    'coaches': [coach.model_dump() for coach in coaches],
+                    'count': len(coaches)
+                }),
+                status=200,
+                mimetype='application/json'
+            )
         except Exception as e:
             logger.error(f"Failed to get coaches: {e}")
             return jsonify({
@@ -131,70 +139,8 @@ def create_app():
                 'message': str(e)
             }), 500
     
-    # Start Kafka consumer in background thread
-    def start_kafka_consumer():
-        """Start Kafka consumer in background"""
-        try:
-            kafka_service.start_consumer(
-                topic=Config.KAFKA_REQUEST_TOPIC,
-                callback=lambda message: handle_matching_request(
-                    message, matching_service, kafka_service
-                )
-            )
-        except Exception as e:
-            logger.error(f"Kafka consumer failed: {e}")
-    
-    # Start background thread for Kafka consumer
-    consumer_thread = threading.Thread(target=start_kafka_consumer, daemon=True)
-    consumer_thread.start()
-    logger.info("Kafka consumer started in background thread")
-    
     return app
 
-def handle_matching_request(message, matching_service, kafka_service):
-    """Handle incoming matching request from Kafka"""
-    try:
-        logger.info(f"Processing matching request: {message.get('request_id')}")
-        
-        # Parse request
-        matching_request = MatchingRequest(**message)
-        
-        # Perform matching
-        matches = matching_service.find_matches(matching_request)
-        
-        # Create response
-        response = MatchingResponse(
-            request_id=matching_request.request_id,
-            matches=matches,
-            processing_time_ms=matching_service.get_last_processing_time(),
-            algorithm_version=matching_service.get_algorithm_version(),
-            timestamp=matching_service.get_current_timestamp()
-        )
-        
-        # Publish response to Kafka
-        kafka_service.publish_response(
-            topic=Config.KAFKA_RESPONSE_TOPIC,
-            response=response.dict()
-        )
-        
-        logger.info(f"Matching completed for request {matching_request.request_id}: {len(matches)} matches found")
-        
-    except Exception as e:
-        logger.error(f"Failed to process matching request: {e}")
-        
-        # Send error response
-        error_response = {
-            'request_id': message.get('request_id', 'unknown'),
-            'error': 'Matching failed',
-            'message': str(e),
-            'timestamp': matching_service.get_current_timestamp()
-        }
-        
-        kafka_service.publish_response(
-            topic=Config.KAFKA_ERROR_TOPIC,
-            response=error_response
-        )
-
 if __name__ == '__main__':
     app = create_app()
     
@@ -213,6 +159,7 @@ if __name__ == '__main__':
             '--bind', f"0.0.0.0:{os.getenv('PORT', 5000)}",
             '--workers', '4',
             '--timeout', '120',
+            '--preload',
             'app:create_app()'
         ]
         wsgi.run()
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Peptok Coach Matching Consumer
+
+Standalone Kafka consumer for matching requests. Runs as its own process
+alongside the gunicorn web workers so that consuming is not contended with
+HTTP handling and every web worker does not join the consumer group. Scale
+throughput by running more consumer processes (up to the topic's partition
+count).
+
+Usage: python -m consumer
+"""
+
+import logging
+import signal
+import orjson
+from dotenv import load_dotenv
+
+from src.services.kafka_service import KafkaService
+from src.services.matching_service import MatchingService
+from src.models.request_models import MatchingRequest, MatchingResponse
+from src.config.settings import Config
+
+# Load environment variables
+load_dotenv()
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+def _request_id(payload: bytes) -> str:
+    """Best-effort request id from a payload that failed to validate"""
+    try:
+        return orjson.loads(payload).get('request_id', 'unknown')
+    except (orjson.JSONDecodeError, AttributeError):
+        return 'unknown'
+
+def handle_matching_request(payload: bytes, matching_service, kafka_service):
+    """Handle incoming matching request from Kafka"""
+    try:
+        # Parse and validate straight from the wire bytes without an intermediate dict
+        matching_request = MatchingRequest.model_validate_json(payload)
+        
+        logger.info(f"Processing matching request: {matching_request.request_id}")
+        
+        # Perform matching
+        matches, processing_time = matching_service.find_matches(matching_request)
+        
+        # Create response
+        response = MatchingResponse(
+            request_id=matching_request.request_id,
+            matches=matches,
+            processing_time_ms=processing_time,
+            algorithm_version=matching_service.get_algorithm_version(),
+            timestamp=matching_service.get_current_timestamp()
+        )
+        
+        # Publish response to Kafka
+        kafka_service.publish_response(
+            topic=Config.KAFKA_RESPONSE_TOPIC,
+            response=response.model_dump()
+        )
+        
+        logger.info(f"Matching completed for request {matching_request.request_id}: {len(matches)} matches found")
+        
+    except Exception as e:
+        logger.error(f"Failed to process matching request: {e}")
+        
+        # Send error response
+        error_response = {
+            'request_id': _request_id(payload),
+            'error': 'Matching failed',
+            'message': str(e),
+            'timestamp': matching_service.get_current_timestamp()
+        }
+        
+        kafka_service.publish_response(
+            topic=Config.KAFKA_ERROR_TOPIC,
+            response=error_response
+        )
+
+def main():
+    """Consume matching requests on the main thread until stopped"""
+    kafka_service = KafkaService()
+    matching_service = MatchingService()
+    
+    # docker stop sends SIGTERM; finish in-flight messages and close the consumer instead of dying
+    signal.signal(signal.SIGTERM, lambda signum, frame: kafka_service.stop_consumer())
+    
+    try:
+        kafka_service.start_consumer(
+            topic=Config.KAFKA_REQUEST_TOPIC,
+            callback=lambda payload: handle_matching_request(
+                payload, matching_service, kafka_service
+            ),
+            decode=False
+        )
+    except KeyboardInterrupt:
+        logger.info("Kafka consumer interrupted")
+    finally:
+        kafka_service.stop_consumer()
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,36 @@
+#!/bin/bash
+# Start the matching service: "web" runs gunicorn, "consumer" runs the Kafka
+# matching consumer and "all" (the default) runs both in one container.
+# Any other command is executed as given.
+set -e
+
+web_cmd=(gunicorn --bind 0.0.0.0:5000 --workers 4 --timeout 120 --preload "app:create_app()")
+
+case "${1:-all}" in
+    web)
+        exec "${web_cmd[@]}"
+        ;;
+    consumer)
+        exec python -m consumer
+        ;;
+    all)
+        python -m consumer &
+        consumer_pid=$!
+        "${web_cmd[@]}" &
+        web_pid=$!
+        
+        # Forward stop signals to both processes so each shuts down cleanly
+        trap 'kill -TERM "$consumer_pid" "$web_pid" 2>/dev/null' TERM INT
+        
+        # Stop the container as soon as either process exits, so a dead consumer
+        # is restarted by the orchestrator instead of hiding behind a healthy web server
+        status=0
+        wait -n || status=$?
+        kill -TERM "$consumer_pid" "$web_pid" 2>/dev/null || true
+        wait || true
+        exit "$status"
+        ;;
+    *)
+        exec "$@"
+        ;;
+esac
@@ -3,7 +3,15 @@ Configuration settings for the matching service
 """
 
 import os
-from typing import List, Dict, Any
+from functools import lru_cache
+from typing import List, Dict
+
+def _normalize_weights(weights: Dict[str, float]) -> Dict[str, float]:
+    """Normalize weights to sum to 1.0"""
+    total_weight = sum(weights.values())
+    if total_weight > 0:
+        weights = {k: v / total_weight for k, v in weights.items()}
+    return weights
 
 class Config:
     """Configuration class for the matching service"""
@@ -18,12 +26,19 @@ class Config:
     KAFKA_RESPONSE_TOPIC = os.getenv('KAFKA_RESPONSE_TOPIC', 'matching-responses')
     KAFKA_ERROR_TOPIC = os.getenv('KAFKA_ERROR_TOPIC', 'matching-errors')
     KAFKA_CONSUMER_GROUP = os.getenv('KAFKA_CONSUMER_GROUP', 'matching-service')
+    KAFKA_CONSUMER_BATCH_SIZE = int(os.getenv('KAFKA_CONSUMER_BATCH_SIZE', 500))
+    KAFKA_REQUEST_TOPIC_PARTITIONS = int(os.getenv('KAFKA_REQUEST_TOPIC_PARTITIONS', 3))
+    # Each partition is handled by one worker, so workers beyond the partition count sit idle
+    KAFKA_CONSUMER_WORKERS = int(os.getenv(
+        'KAFKA_CONSUMER_WORKERS', min(os.cpu_count() or 1, KAFKA_REQUEST_TOPIC_PARTITIONS)
+    ))
     
     # Redis settings
     REDIS_HOST = os.getenv('REDIS_HOST', 'redis')
     REDIS_PORT = int(os.getenv('REDIS_PORT', 6379))
     REDIS_DB = int(os.getenv('REDIS_DB', 0))
     REDIS_PASSWORD = os.getenv('REDIS_PASSWORD')
+    REDIS_MAX_CONNECTIONS = int(os.getenv('REDIS_MAX_CONNECTIONS', 32))
     
     # Matching algorithm settings
     MATCHING_ALGORITHM_VERSION = '1.0.0'
@@ -37,9 +52,19 @@ class Config:
     AVAILABILITY_WEIGHT = float(os.getenv('AVAILABILITY_WEIGHT', 0.15))
     PRICE_WEIGHT = float(os.getenv('PRICE_WEIGHT', 0.1))
     
+    # Weights are fixed at import time, so normalize them once
+    NORMALIZED_WEIGHTS = _normalize_weights({
+        'skills': SKILL_MATCH_WEIGHT,
+        'experience': EXPERIENCE_WEIGHT,
+        'rating': RATING_WEIGHT,
+        'availability': AVAILABILITY_WEIGHT,
+        'price': PRICE_WEIGHT
+    })
+    
     # Coach data settings
     COACH_DATA_TTL = int(os.getenv('COACH_DATA_TTL', 3600))  # 1 hour
     REFRESH_COACH_DATA_INTERVAL = int(os.getenv('REFRESH_COACH_DATA_INTERVAL', 1800))  # 30 minutes
+    COACH_DATA_STALE_TTL = int(os.getenv('COACH_DATA_STALE_TTL', 3600))  # Serve stale data this long while refreshing
     
     # External service URLs
     BACKEND_API_URL = os.getenv('BACKEND_API_URL', 'http://backend:3001/api')
@@ -50,20 +75,7 @@ class Config:
     @classmethod
     def get_matching_weights(cls) -> Dict[str, float]:
         """Get normalized matching weights"""
-        weights = {
-            'skills': cls.SKILL_MATCH_WEIGHT,
-            'experience': cls.EXPERIENCE_WEIGHT,
-            'rating': cls.RATING_WEIGHT,
-            'availability': cls.AVAILABILITY_WEIGHT,
-            'price': cls.PRICE_WEIGHT
-        }
-        
-        # Normalize weights to sum to 1.0
-        total_weight = sum(weights.values())
-        if total_weight > 0:
-            weights = {k: v / total_weight for k, v in weights.items()}
-        
-        return weights
+        return cls.NORMALIZED_WEIGHTS
     
     @classmethod
     def validate_config(cls) -> List[str]:
@@ -125,4 +137,9 @@ def get_config(env_name: str = None) -> Config:
     if env_name is None:
         env_name = os.getenv('FLASK_ENV', 'default')
     
+    return _get_config(env_name)
+
+@lru_cache(maxsize=None)
+def _get_config(env_name: str) -> Config:
+    """Resolve a configuration class by environment name"""
     return config_map.get(env_name, config_map['default'])
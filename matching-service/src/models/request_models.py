@@ -2,11 +2,21 @@
 Pydantic models for matching service requests and responses
 """
 
-from typing import List, Dict, Optional, Any
-from pydantic import BaseModel, Field, validator
-from datetime import datetime
+import threading
+import time
+from typing import Annotated, List, Dict, FrozenSet, Iterable, Optional, Any
+from pydantic import BaseModel, ConfigDict, Field, PrivateAttr, model_validator
+from datetime import datetime, timezone
 from enum import Enum
 
+def utc_now() -> datetime:
+    """Current UTC time as an aware datetime, built straight from the epoch clock"""
+    return datetime.fromtimestamp(time.time(), tz=timezone.utc)
+
+# Shared constrained types so every field reuses one core schema
+TimeStr = Annotated[str, Field(pattern=r'^[0-2]\d:[0-5]\d$')]
+DayOfWeek = Annotated[int, Field(ge=0, le=6)]
+
 class ExpertiseLevel(str, Enum):
     """Expertise level enumeration"""
     BEGINNER = "beginner"
@@ -21,6 +31,38 @@ class SessionType(str, Enum):
     WORKSHOP = "workshop"
     MENTORING = "mentoring"
 
+# One bit per session type
+SESSION_TYPE_BITS = {session_type.value: 1 << i for i, session_type in enumerate(SessionType)}
+
+# Process-wide language bit positions, grown as new languages are seen
+_LANGUAGE_BITS: Dict[str, int] = {}
+_LANGUAGE_BITS_LOCK = threading.Lock()
+
+def language_mask(languages: Iterable[str]) -> int:
+    """Bit mask of languages, assigning bits to unseen languages"""
+    mask = 0
+    for language in languages:
+        bit = _LANGUAGE_BITS.get(language)
+        if bit is None:
+            with _LANGUAGE_BITS_LOCK:
+                bit = _LANGUAGE_BITS.setdefault(language, len(_LANGUAGE_BITS))
+        mask |= 1 << bit
+    return mask
+
+def session_mask(session_types: Iterable[str]) -> int:
+    """Bit mask of session types"""
+    mask = 0
+    for session_type in session_types:
+        mask |= SESSION_TYPE_BITS[session_type]
+    return mask
+
+def day_mask(days: Iterable[int]) -> int:
+    """Bit mask of days of the week, bit 0 = Monday"""
+    mask = 0
+    for day in days:
+        mask |= 1 << day
+    return mask
+
 class PriorityLevel(str, Enum):
     """Priority level enumeration"""
     LOW = "low"
@@ -30,13 +72,25 @@ class PriorityLevel(str, Enum):
 
 class SkillRequirement(BaseModel):
     """Skill requirement model"""
+    model_config = ConfigDict(frozen=True, extra='ignore')
+
     name: str = Field(..., description="Skill name")
     level: ExpertiseLevel = Field(..., description="Required expertise level")
     weight: float = Field(default=1.0, ge=0.0, le=1.0, description="Importance weight")
     mandatory: bool = Field(default=False, description="Whether this skill is mandatory")
 
+    # Lowercased name, matched against the coach skill indexes
+    _name_key: str = PrivateAttr(default='')
+
+    @model_validator(mode='after')
+    def build_name_key(self) -> 'SkillRequirement':
+        self._name_key = self.name.lower()
+        return self
+
 class BudgetConstraint(BaseModel):
     """Budget constraint model"""
+    model_config = ConfigDict(frozen=True, extra='ignore')
+
     max_hourly_rate: Optional[float] = Field(None, ge=0, description="Maximum hourly rate")
     total_budget: Optional[float] = Field(None, ge=0, description="Total budget for the program")
     currency: str = Field(default="USD", description="Currency code")
@@ -44,20 +98,15 @@ class BudgetConstraint(BaseModel):
 
 class AvailabilityRequirement(BaseModel):
     """Availability requirement model"""
-    days_of_week: List[int] = Field(..., description="Required days (0=Monday, 6=Sunday)")
+    days_of_week: List[DayOfWeek] = Field(..., max_length=7, description="Required days (0=Monday, 6=Sunday)")
     time_slots: List[str] = Field(..., description="Preferred time slots")
     timezone: str = Field(default="UTC", description="Timezone")
     flexibility: float = Field(default=0.5, ge=0.0, le=1.0, description="Schedule flexibility")
 
-    @validator('days_of_week', pre=True)
-    def validate_days_of_week(cls, v):
-        if isinstance(v, list):
-            for day in v:
-                if not 0 <= day <= 6:
-                    raise ValueError("Days of week must be between 0 (Monday) and 6 (Sunday)")
-        return v
 class MatchingRequest(BaseModel):
     """Main matching request model"""
+    model_config = ConfigDict(use_enum_values=True)
+
     request_id: str = Field(..., description="Unique request identifier")
     company_id: str = Field(..., description="Company identifier")
     program_id: str = Field(..., description="Program identifier")
@@ -66,7 +115,7 @@ class MatchingRequest(BaseModel):
     title: str = Field(..., description="Program title")
     description: str = Field(..., description="Program description")
     session_type: SessionType = Field(..., description="Type of sessions")
-    priority: PriorityLevel = Field(default=PriorityLevel.MEDIUM, description="Request priority")
+    priority: PriorityLevel = Field(default=PriorityLevel.MEDIUM.value, description="Request priority")
     
     # Requirements
     skills_required: List[SkillRequirement] = Field(..., description="Required skills")
@@ -75,7 +124,7 @@ class MatchingRequest(BaseModel):
     availability_requirements: AvailabilityRequirement = Field(..., description="Availability needs")
     
     # Preferences
-    preferred_languages: List[str] = Field(default=["English"], description="Preferred languages")
+    preferred_languages: List[str] = Field(default_factory=lambda: ["English"], description="Preferred languages")
     location_preference: Optional[str] = Field(None, description="Location preference")
     coach_gender_preference: Optional[str] = Field(None, description="Coach gender preference")
     
@@ -87,24 +136,50 @@ class MatchingRequest(BaseModel):
     end_date: Optional[datetime] = Field(None, description="Preferred end date")
     
     # Timestamp
-    created_at: datetime = Field(default_factory=datetime.utcnow, description="Request creation time")
+    created_at: datetime = Field(default_factory=utc_now, description="Request creation time")
+
+    # Bit masks for the hard filters
+    _language_mask: int = PrivateAttr(default=0)
+    _session_mask: int = PrivateAttr(default=0)
+    _day_mask: int = PrivateAttr(default=0)
+
+    @model_validator(mode='after')
+    def build_masks(self) -> 'MatchingRequest':
+        self._language_mask = language_mask(self.preferred_languages)
+        self._session_mask = session_mask((self.session_type,))
+        self._day_mask = day_mask(self.availability_requirements.days_of_week)
+        return self
 
 class CoachSkill(BaseModel):
     """Coach skill model"""
+    model_config = ConfigDict(frozen=True, extra='ignore')
+
     name: str = Field(..., description="Skill name")
     level: ExpertiseLevel = Field(..., description="Expertise level")
     years_experience: int = Field(..., ge=0, description="Years of experience")
-    certifications: List[str] = Field(default=[], description="Related certifications")
+    certifications: List[str] = Field(default_factory=list, description="Related certifications")
+
+    # Lowercased name for case-insensitive skill matching
+    _name_key: str = PrivateAttr(default='')
+
+    @model_validator(mode='after')
+    def build_name_key(self) -> 'CoachSkill':
+        self._name_key = self.name.lower()
+        return self
 
 class CoachAvailability(BaseModel):
     """Coach availability model"""
+    model_config = ConfigDict(frozen=True, extra='ignore')
+
     day_of_week: int = Field(..., ge=0, le=6, description="Day of week (0=Monday)")
-    start_time: str = Field(..., description="Start time (HH:MM)")
-    end_time: str = Field(..., description="End time (HH:MM)")
+    start_time: TimeStr = Field(..., description="Start time (HH:MM)")
+    end_time: TimeStr = Field(..., description="End time (HH:MM)")
     timezone: str = Field(default="UTC", description="Timezone")
 
 class CoachProfile(BaseModel):
     """Coach profile model"""
+    model_config = ConfigDict(use_enum_values=True)
+
     coach_id: str = Field(..., description="Unique coach identifier")
     user_id: str = Field(..., description="User identifier")
     
@@ -134,7 +209,7 @@ class CoachProfile(BaseModel):
     response_time_hours: float = Field(default=24.0, ge=0, description="Average response time")
     
     # Preferences
-    languages: List[str] = Field(default=["English"], description="Languages spoken")
+    languages: List[str] = Field(default_factory=lambda: ["English"], description="Languages spoken")
     max_participants: int = Field(default=1, ge=1, description="Maximum participants per session")
     session_types: List[SessionType] = Field(..., description="Supported session types")
     
@@ -142,6 +217,20 @@ class CoachProfile(BaseModel):
     is_active: bool = Field(default=True, description="Whether coach is active")
     can_accept_new_clients: bool = Field(default=True, description="Whether accepting new clients")
 
+    # Lowercased skill names for constant-time skill lookups, and bit masks for the hard filters
+    _skill_index: FrozenSet[str] = PrivateAttr(default_factory=frozenset)
+    _language_mask: int = PrivateAttr(default=0)
+    _session_mask: int = PrivateAttr(default=0)
+    _day_mask: int = PrivateAttr(default=0)
+
+    @model_validator(mode='after')
+    def build_indexes(self) -> 'CoachProfile':
+        self._skill_index = frozenset(skill._name_key for skill in self.skills)
+        self._language_mask = language_mask(self.languages)
+        self._session_mask = session_mask(self.session_types)
+        self._day_mask = day_mask(avail.day_of_week for avail in self.availability)
+        return self
+
 class MatchResult(BaseModel):
     """Individual match result"""
     coach: CoachProfile = Field(..., description="Matched coach profile")
@@ -156,7 +245,7 @@ class MatchResult(BaseModel):
     
     # Match details
     matching_skills: List[str] = Field(..., description="Skills that matched")
-    missing_skills: List[str] = Field(default=[], description="Required skills not met")
+    missing_skills: List[str] = Field(default_factory=list, description="Required skills not met")
     availability_overlap: float = Field(..., ge=0.0, le=1.0, description="Schedule overlap percentage")
     price_difference_percent: float = Field(..., description="Price difference from budget")
     
@@ -173,19 +262,19 @@ class MatchingResponse(BaseModel):
     total_coaches_evaluated: int = Field(..., ge=0, description="Total coaches considered")
     processing_time_ms: int = Field(..., ge=0, description="Processing time in milliseconds")
     algorithm_version: str = Field(..., description="Algorithm version used")
-    timestamp: datetime = Field(default_factory=datetime.utcnow, description="Response timestamp")
+    timestamp: datetime = Field(default_factory=utc_now, description="Response timestamp")
     
     # Statistics
     average_match_score: float = Field(..., ge=0.0, le=1.0, description="Average match score")
     best_match_score: float = Field(..., ge=0.0, le=1.0, description="Best match score")
     
     # Filters applied
-    filters_applied: Dict[str, Any] = Field(default={}, description="Filters that were applied")
+    filters_applied: Dict[str, Any] = Field(default_factory=dict, description="Filters that were applied")
 
 class MatchingError(BaseModel):
     """Matching error model"""
     request_id: str = Field(..., description="Request identifier")
     error_code: str = Field(..., description="Error code")
     error_message: str = Field(..., description="Error message")
-    timestamp: datetime = Field(default_factory=datetime.utcnow, description="Error timestamp")
-    details: Dict[str, Any] = Field(default={}, description="Additional error details")
+    timestamp: datetime = Field(default_factory=utc_now, description="Error timestamp")
+    details: Dict[str, Any] = Field(default_factory=dict, description="Additional error details")
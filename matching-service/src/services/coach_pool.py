@@ -0,0 +1,123 @@
+"""
+Structure-of-arrays projection of coach profiles used for vectorized scoring
+"""
+
+from dataclasses import dataclass
+from typing import Dict, List
+import numpy as np
+
+from src.models.request_models import CoachProfile, ExpertiseLevel
+
+# Numeric skill levels; 0 in the level matrix means the coach lacks the skill
+SKILL_LEVELS = {
+    ExpertiseLevel.BEGINNER: 1,
+    ExpertiseLevel.INTERMEDIATE: 2,
+    ExpertiseLevel.EXPERT: 3,
+    ExpertiseLevel.MASTER: 4
+}
+
+DAYS_PER_WEEK = 7
+
+# Set-bit counts for every 7-bit day mask
+DAY_POPCOUNT = np.array([bin(mask).count('1') for mask in range(1 << DAYS_PER_WEEK)], dtype=np.int8)
+
+# Language masks are stored in the pool as uint64 words
+WORD_MASK = (1 << 64) - 1
+
+def _split_words(mask: int, n_words: int) -> List[int]:
+    """Low-to-high 64-bit words of a bit mask; higher bits are dropped"""
+    return [(mask >> (64 * word)) & WORD_MASK for word in range(n_words)]
+
+def _saturate(values: List[int], dtype) -> np.ndarray:
+    """Non-negative integers as a narrow array, clamped at the dtype's maximum instead of wrapping"""
+    cap = int(np.iinfo(dtype).max)
+    return np.fromiter((min(value, cap) for value in values), dtype=dtype, count=len(values))
+
+def rating_scores(rating: np.ndarray, total_sessions: np.ndarray, success_rate: np.ndarray) -> np.ndarray:
+    """Request-independent rating score per coach"""
+    # Normalized rating plus bonuses for session count and success rate
+    scores = np.minimum(rating / 5.0 + np.minimum(total_sessions / 100.0, 0.2) + success_rate * 0.1, 1.0)
+
+    # Neutral for new coaches
+    return np.where(rating == 0, 0.5, scores)
+
+@dataclass(slots=True)
+class CoachPool:
+    """Scoreable coaches with their numeric attributes laid out as parallel arrays"""
+    coaches: List[CoachProfile]
+    hourly_rate: np.ndarray
+    rating: np.ndarray
+    total_experience_years: np.ndarray
+    total_sessions: np.ndarray
+    success_rate: np.ndarray
+    rating_score: np.ndarray
+    skill_vocab: Dict[str, int]
+    level_matrix: np.ndarray
+    years_matrix: np.ndarray
+    max_participants: np.ndarray
+    session_mask: np.ndarray
+    day_mask: np.ndarray
+    language_bits: np.ndarray
+    # Coach data version the pool was built from, part of the match cache key
+    data_version: int = 0
+
+    def __len__(self) -> int:
+        return len(self.coaches)
+
+    def language_words(self, mask: int) -> np.ndarray:
+        """Split a language mask into words aligned with language_bits"""
+        return np.array(_split_words(mask, self.language_bits.shape[1]), dtype=np.uint64)
+
+    @classmethod
+    def from_profiles(cls, coaches: List[CoachProfile]) -> "CoachPool":
+        """Project validated coach profiles into column arrays"""
+        skill_vocab: Dict[str, int] = {}
+        rows, cols, levels, years = [], [], [], []
+
+        for row, coach in enumerate(coaches):
+            seen = set()
+            for skill in coach.skills:
+                col = skill_vocab.setdefault(skill._name_key, len(skill_vocab))
+                # Only the first entry counts, matching the profile lookup order
+                if col in seen:
+                    continue
+                seen.add(col)
+                rows.append(row)
+                cols.append(col)
+                levels.append(SKILL_LEVELS.get(skill.level, 2))
+                years.append(skill.years_experience)
+
+        # Dense (coach x skill) matrices; the skill vocabulary is small enough to keep them compact
+        level_matrix = np.zeros((len(coaches), len(skill_vocab)), dtype=np.int8)
+        level_matrix[rows, cols] = levels
+        years_matrix = np.zeros((len(coaches), len(skill_vocab)), dtype=np.int16)
+        # Profiles only bound years below, and the bonus saturates after a year anyway
+        years_matrix[rows, cols] = _saturate(years, np.int16)
+
+        # Languages are open-ended, so spread their bits over as many uint64 words as needed
+        highest_bit = max((coach._language_mask.bit_length() for coach in coaches), default=0)
+        n_language_words = max(1, -(-highest_bit // 64))
+
+        # Rates and ratings stay float64 so scores match the profile values exactly
+        rating = np.array([coach.rating for coach in coaches], dtype=np.float64)
+        total_sessions = _saturate([coach.total_sessions for coach in coaches], np.int32)
+        success_rate = np.array([coach.success_rate for coach in coaches], dtype=np.float64)
+
+        return cls(
+            coaches=coaches,
+            hourly_rate=np.array([coach.hourly_rate for coach in coaches], dtype=np.float64),
+            rating=rating,
+            total_experience_years=_saturate([coach.total_experience_years for coach in coaches], np.int32),
+            total_sessions=total_sessions,
+            success_rate=success_rate,
+            rating_score=rating_scores(rating, total_sessions, success_rate),
+            skill_vocab=skill_vocab,
+            level_matrix=level_matrix,
+            years_matrix=years_matrix,
+            max_participants=_saturate([coach.max_participants for coach in coaches], np.int32),
+            session_mask=np.array([coach._session_mask for coach in coaches], dtype=np.uint8),
+            day_mask=np.array([coach._day_mask for coach in coaches], dtype=np.uint8),
+            language_bits=np.array([
+                _split_words(coach._language_mask, n_language_words) for coach in coaches
+            ], dtype=np.uint64).reshape(len(coaches), n_language_words)
+        )
@@ -2,16 +2,23 @@
 Kafka service for asynchronous communication with the backend
 """
 
-import json
+import atexit
 import logging
+import queue
 import threading
-from typing import Callable, Dict, Any, Optional
-from confluent_kafka import Consumer, Producer, KafkaError, KafkaException
+import time
+import orjson
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Any, List, Optional, Tuple
+from confluent_kafka import Consumer, Producer, KafkaError, KafkaException, TopicPartition
 from confluent_kafka.admin import AdminClient, NewTopic
 from src.config.settings import Config
 
 logger = logging.getLogger(__name__)
 
+# Queued to each consumer worker to make it exit
+_STOP_WORKER = object()
+
 class KafkaService:
     """Kafka service for handling messaging between services"""
     
@@ -20,7 +27,17 @@ class KafkaService:
         self.producer: Optional[Producer] = None
         self.admin_client: Optional[AdminClient] = None
         self.is_running = False
+        self._metadata_cache = (0.0, None)
+        
+        # Per-worker message queues and the last handled offset per (topic, partition)
+        self._pending: List[queue.Queue] = []
+        self._paused = False
+        self._handled_offsets: Dict[Tuple[str, int], int] = {}
+        self._offsets_lock = threading.Lock()
         self._init_clients()
+        
+        # Deliver anything still queued when the process exits
+        atexit.register(self.flush)
     
     def _init_clients(self):
         """Initialize Kafka clients"""
@@ -29,11 +46,16 @@ class KafkaService:
             kafka_config = {
                 'bootstrap.servers': Config.KAFKA_BOOTSTRAP_SERVERS,
                 'client.id': 'matching-service',
-                'enable.auto.commit': True,
+                # Offsets are committed by the workers once each message is handled
+                'enable.auto.commit': False,
                 'auto.offset.reset': 'latest',
                 'group.id': Config.KAFKA_CONSUMER_GROUP,
                 'session.timeout.ms': 30000,
                 'heartbeat.interval.ms': 10000,
+                # Let the broker accumulate batches for consume(), bounded
+                # so an idle topic adds at most 100ms of latency
+                'fetch.min.bytes': 16384,
+                'fetch.wait.max.ms': 100,
             }
             
             # Initialize consumer
@@ -46,6 +68,11 @@ class KafkaService:
                 'acks': 'all',
                 'retries': 3,
                 'retry.backoff.ms': 1000,
+                # Batch and compress small JSON responses instead of sending each alone
+                'linger.ms': 20,
+                'batch.size': 131072,
+                'compression.type': 'lz4',
+                'queue.buffering.max.messages': 100000,
             }
             self.producer = Producer(producer_config)
             
@@ -62,6 +89,16 @@ class KafkaService:
             logger.error(f"Failed to initialize Kafka clients: {e}")
             raise
     
+    def _get_metadata(self, ttl: float = 5.0, timeout: float = 5):
+        """Get cluster metadata, reusing a recent list_topics result"""
+        fetched_at, metadata = self._metadata_cache
+        if metadata is not None and time.monotonic() - fetched_at < ttl:
+            return metadata
+        
+        metadata = self.admin_client.list_topics(timeout=timeout)
+        self._metadata_cache = (time.monotonic(), metadata)
+        return metadata
+    
     def ensure_topics_exist(self):
         """Ensure required Kafka topics exist"""
         try:
@@ -69,7 +106,7 @@ class KafkaService:
             topics = [
                 NewTopic(
                     topic=Config.KAFKA_REQUEST_TOPIC,
-                    num_partitions=3,
+                    num_partitions=Config.KAFKA_REQUEST_TOPIC_PARTITIONS,
                     replication_factor=1
                 ),
                 NewTopic(
@@ -85,7 +122,7 @@ class KafkaService:
             ]
             
             # Check existing topics
-            topic_metadata = self.admin_client.list_topics(timeout=10)
+            topic_metadata = self._get_metadata(timeout=10)
             existing_topics = set(topic_metadata.topics.keys())
             
             # Create missing topics
@@ -102,6 +139,7 @@ class KafkaService:
                     try:
                         f.result()  # The result itself is None
                         logger.info(f"Topic {topic} created successfully")
+                        self._metadata_cache = (0.0, None)
                     except Exception as e:
                         logger.error(f"Failed to create topic {topic}: {e}")
             else:
@@ -111,8 +149,10 @@ class KafkaService:
             logger.error(f"Failed to ensure topics exist: {e}")
             raise
     
-    def start_consumer(self, topic: str, callback: Callable[[Dict[str, Any]], None]):
-        """Start consuming messages from a topic"""
+    def start_consumer(self, topic: str, callback: Callable[[Any], None], decode: bool = True):
+        """Start consuming messages from a topic; with decode=False the callback gets the raw bytes"""
+        workers = None
+        
         try:
             if not self.consumer:
                 raise Exception("Consumer not initialized")
@@ -120,39 +160,47 @@ class KafkaService:
             # Ensure topics exist
             self.ensure_topics_exist()
             
+            # Partitions map to workers one-to-one, so more workers than partitions would sit idle
+            n_workers = self._consumer_worker_count(topic)
+            self._pending = [queue.Queue() for _ in range(n_workers)]
+            self._paused = False
+            
             # Subscribe to topic
-            self.consumer.subscribe([topic])
+            self.consumer.subscribe([topic], on_revoke=self._on_revoke)
             self.is_running = True
             
-            logger.info(f"Started consuming from topic: {topic}")
+            # Decode and handle messages on a worker pool so polling never waits on processing.
+            # Each partition always goes to the same worker, so its messages are handled and
+            # committed in order
+            workers = ThreadPoolExecutor(
+                max_workers=n_workers,
+                thread_name_prefix='kafka-consumer'
+            )
+            for worker_queue in self._pending:
+                workers.submit(self._process_messages, worker_queue, callback, decode)
+            
+            logger.info(f"Started consuming from topic: {topic} with {n_workers} workers")
             
             while self.is_running:
                 try:
-                    # Poll for messages
-                    msg = self.consumer.poll(timeout=1.0)
-                    
-                    if msg is None:
-                        continue
+                    # Fetch a batch of messages in one call; this keeps running while paused so
+                    # the consumer stays in the group however far the workers fall behind
+                    msgs = self.consumer.consume(
+                        num_messages=Config.KAFKA_CONSUMER_BATCH_SIZE,
+                        timeout=1.0
+                    )
                     
-                    if msg.error():
-                        if msg.error().code() == KafkaError._PARTITION_EOF:
-                            logger.debug(f"Reached end of partition {msg.partition()}")
-                        else:
-                            logger.error(f"Consumer error: {msg.error()}")
-                        continue
-                    
-                    # Process message
-                    try:
-                        message_data = json.loads(msg.value().decode('utf-8'))
-                        logger.info(f"Received message: {message_data.get('request_id', 'unknown')}")
-                        
-                        # Call the callback function
-                        callback(message_data)
+                    for msg in msgs:
+                        if msg.error():
+                            if msg.error().code() == KafkaError._PARTITION_EOF:
+                                logger.debug(f"Reached end of partition {msg.partition()}")
+                            else:
+                                logger.error(f"Consumer error: {msg.error()}")
+                            continue
                         
-                    except json.JSONDecodeError as e:
-                        logger.error(f"Failed to decode message: {e}")
-                    except Exception as e:
-                        logger.error(f"Error processing message: {e}")
+                        self._pending[msg.partition() % n_workers].put(msg)
+                    
+                    self._apply_backpressure()
                 
                 except KafkaException as e:
                     logger.error(f"Kafka exception: {e}")
@@ -161,40 +209,163 @@ class KafkaService:
             logger.error(f"Consumer failed: {e}")
             raise
         finally:
+            if workers is not None:
+                # Let the workers finish what was already fetched
+                for worker_queue in self._pending:
+                    worker_queue.put(_STOP_WORKER)
+                workers.shutdown(wait=True)
             if self.consumer:
                 self.consumer.close()
     
+    def _consumer_worker_count(self, topic: str) -> int:
+        """Configured worker count, capped at the topic's partition count"""
+        try:
+            partitions = len(self._get_metadata().topics[topic].partitions)
+        except Exception as e:
+            logger.warning(f"Failed to read partition count for {topic}: {e}")
+            return Config.KAFKA_CONSUMER_WORKERS
+        return max(1, min(Config.KAFKA_CONSUMER_WORKERS, partitions))
+    
+    def _apply_backpressure(self):
+        """Pause fetching while any worker queue is above its high-water mark and resume once all drain"""
+        high_water = Config.KAFKA_CONSUMER_BATCH_SIZE
+        depth = max(worker_queue.qsize() for worker_queue in self._pending)
+        
+        if not self._paused and depth >= high_water:
+            self.consumer.pause(self.consumer.assignment())
+            self._paused = True
+            logger.warning(f"Consumer workers behind by {depth} messages, pausing fetch")
+        elif self._paused and depth <= high_water // 2:
+            self.consumer.resume(self.consumer.assignment())
+            self._paused = False
+            logger.info("Consumer workers caught up, resuming fetch")
+    
+    def _on_revoke(self, consumer: Consumer, partitions: List[TopicPartition]):
+        """Hand revoked partitions over cleanly: drop their queued messages and wait for in-flight ones"""
+        revoked = {(tp.topic, tp.partition) for tp in partitions}
+        
+        dropped = 0
+        for worker_queue in self._pending:
+            with worker_queue.mutex:
+                kept = [
+                    msg for msg in worker_queue.queue
+                    if msg is _STOP_WORKER or (msg.topic(), msg.partition()) not in revoked
+                ]
+                dropped += len(worker_queue.queue) - len(kept)
+                worker_queue.unfinished_tasks -= len(worker_queue.queue) - len(kept)
+                worker_queue.queue.clear()
+                worker_queue.queue.extend(kept)
+                if not worker_queue.unfinished_tasks:
+                    worker_queue.all_tasks_done.notify_all()
+        
+        # Workers commit after each message, so once they are idle no commit can land after the handoff
+        for worker_queue in self._pending:
+            worker_queue.join()
+        
+        # Commit what was handled synchronously, in case asynchronous commits are still in flight
+        with self._offsets_lock:
+            offsets = [
+                TopicPartition(topic, partition, offset + 1)
+                for (topic, partition), offset in self._handled_offsets.items()
+                if (topic, partition) in revoked
+            ]
+            for key in revoked:
+                self._handled_offsets.pop(key, None)
+        if offsets:
+            try:
+                consumer.commit(offsets=offsets, asynchronous=False)
+            except KafkaException as e:
+                logger.error(f"Failed to commit offsets on revoke: {e}")
+        
+        self._paused = False
+        logger.info(f"Partitions revoked: {len(partitions)}, dropped {dropped} queued messages for redelivery")
+    
+    def _process_messages(self, pending: queue.Queue, callback: Callable[[Any], None], decode: bool):
+        """Decode and handle queued messages until told to stop, committing each one once handled"""
+        while True:
+            msg = pending.get()
+            if msg is _STOP_WORKER:
+                pending.task_done()
+                return
+            
+            # Process message
+            try:
+                message_data = msg.value()
+                if decode:
+                    message_data = orjson.loads(message_data)
+                    if logger.isEnabledFor(logging.INFO):
+                        logger.info(f"Received message: {message_data.get('request_id', 'unknown')}")
+                
+                # Call the callback function
+                callback(message_data)
+                
+            except orjson.JSONDecodeError as e:
+                logger.error(f"Failed to decode message: {e}")
+            except Exception as e:
+                logger.error(f"Error processing message: {e}")
+            
+            # Failed messages are committed too; their errors are already logged or published
+            try:
+                with self._offsets_lock:
+                    self._handled_offsets[(msg.topic(), msg.partition())] = msg.offset()
+                self.consumer.commit(message=msg, asynchronous=True)
+            except KafkaException as e:
+                logger.error(f"Failed to commit offset: {e}")
+            finally:
+                pending.task_done()
+    
     def publish_response(self, topic: str, response: Dict[str, Any]):
         """Publish response to a topic"""
         try:
-            if not self.producer:
+            # Producer defines __len__ (queued messages), so test identity
+            if self.producer is None:
                 raise Exception("Producer not initialized")
             
-            # Serialize response
-            message = json.dumps(response, default=str)
+            # Serialize response straight to bytes
+            message = orjson.dumps(response, default=str)
+            request_id = response.get('request_id') or ''
+            key = (request_id if isinstance(request_id, str) else str(request_id)).encode('utf-8')
             
-            # Produce message
-            self.producer.produce(
-                topic=topic,
-                value=message.encode('utf-8'),
-                key=str(response.get('request_id', '')).encode('utf-8'),
-                callback=self._delivery_callback
-            )
+            # Produce message; if the local queue is full, wait for deliveries and retry once
+            try:
+                self._produce(topic, message, key)
+            except BufferError:
+                logger.warning("Producer queue full, waiting for deliveries")
+                self.producer.poll(1.0)
+                self._produce(topic, message, key)
             
-            # Trigger delivery
-            self.producer.flush(timeout=10)
+            # Serve delivery callbacks without blocking; batches flush in the background
+            self.producer.poll(0)
             
-            logger.info(f"Published response to topic {topic}: {response.get('request_id', 'unknown')}")
+            # Skip formatting per-message logs when they would be dropped
+            if logger.isEnabledFor(logging.INFO):
+                logger.info(f"Published response to topic {topic}: {request_id or 'unknown'}")
             
         except Exception as e:
             logger.error(f"Failed to publish response: {e}")
             raise
     
+    def _produce(self, topic: str, value: bytes, key: bytes):
+        """Enqueue a message on the producer"""
+        self.producer.produce(
+            topic=topic,
+            value=value,
+            key=key,
+            callback=self._delivery_callback
+        )
+    
+    def flush(self, timeout: float = 10):
+        """Wait for queued messages to be delivered"""
+        if self.producer is not None:
+            remaining = self.producer.flush(timeout=timeout)
+            if remaining:
+                logger.warning(f"{remaining} messages still undelivered after flush")
+    
     def _delivery_callback(self, err, msg):
         """Callback for message delivery confirmation"""
         if err:
             logger.error(f"Message delivery failed: {err}")
-        else:
+        elif logger.isEnabledFor(logging.DEBUG):
             logger.debug(f"Message delivered to {msg.topic()} [{msg.partition()}]")
     
     def stop_consumer(self):
@@ -209,7 +380,7 @@ class KafkaService:
                 return False
             
             # Try to get cluster metadata
-            metadata = self.admin_client.list_topics(timeout=5)
+            metadata = self._get_metadata()
             return len(metadata.topics) >= 0
             
         except Exception as e:
@@ -219,7 +390,7 @@ class KafkaService:
     def get_topic_info(self, topic: str) -> Dict[str, Any]:
         """Get information about a specific topic"""
         try:
-            metadata = self.admin_client.list_topics(timeout=5)
+            metadata = self._get_metadata()
             
             if topic in metadata.topics:
                 topic_metadata = metadata.topics[topic]
@@ -239,7 +410,6 @@ class KafkaService:
         """Cleanup when service is destroyed"""
         try:
             self.stop_consumer()
-            if self.producer:
-                self.producer.flush(timeout=5)
+            self.flush(timeout=5)
         except:
             pass
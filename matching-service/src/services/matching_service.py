@@ -2,27 +2,33 @@
 Core matching service with intelligent coach-to-request matching algorithm
 """
 
+import hashlib
 import logging
+import threading
 import time
+import orjson
 import requests
-from typing import List, Dict, Any, Optional
-from datetime import datetime, timedelta
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from typing import List, Dict, Any, Optional, Tuple
+from datetime import datetime
 from dataclasses import dataclass
 import numpy as np
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
-from sklearn.preprocessing import MinMaxScaler
 
 from src.models.request_models import (
-    MatchingRequest, CoachProfile, MatchResult, SkillRequirement,
-    ExpertiseLevel, SessionType
+    MatchingRequest, CoachProfile, MatchResult,
+    ExpertiseLevel, SessionType, utc_now
+)
+from src.services.redis_service import RedisService, COACH_DATA_VERSION_KEY, MATCH_CACHE_KEY_PREFIX
+from src.services import scoring
+from src.services.coach_pool import (
+    CoachPool, SKILL_LEVELS, DAY_POPCOUNT
 )
-from src.services.redis_service import RedisService
 from src.config.settings import Config
 
 logger = logging.getLogger(__name__)
 
-@dataclass
+@dataclass(slots=True)
 class MatchingMetrics:
     """Metrics for a single matching operation"""
     total_coaches: int
@@ -32,6 +38,57 @@ class MatchingMetrics:
     average_score: float
     timestamp: datetime
 
+# Years of experience expected for each requested level
+EXPERIENCE_YEARS = {
+    ExpertiseLevel.BEGINNER: 1,
+    ExpertiseLevel.INTERMEDIATE: 3,
+    ExpertiseLevel.EXPERT: 6,
+    ExpertiseLevel.MASTER: 10
+}
+
+# Slack on score bounds before a coach is pruned without computing its skill score
+SCORE_BOUND_TOLERANCE = 1e-9
+
+@dataclass(slots=True)
+class RequestContext:
+    """Request-derived values shared by the filters and scorers"""
+    max_rate: Optional[float]
+    value_rate: float
+    participants_count: int
+    session_mask: int
+    language_mask: int
+    day_mask: int
+    day_count: int
+    flexibility_bonus: float
+    required_years: int
+    skill_keys: List[str]
+    skill_levels: np.ndarray
+    skill_weights: np.ndarray
+    skill_mandatory: np.ndarray
+    total_skill_weight: float
+    
+    @classmethod
+    def from_request(cls, request: MatchingRequest) -> "RequestContext":
+        """Derive the per-request constants once"""
+        skills = request.skills_required
+        max_rate = request.budget_constraints.max_hourly_rate or None
+        return cls(
+            max_rate=max_rate,
+            value_rate=max_rate * 0.8 if max_rate else 0.0,
+            participants_count=request.participants_count,
+            session_mask=request._session_mask,
+            language_mask=request._language_mask,
+            day_mask=request._day_mask,
+            day_count=request._day_mask.bit_count(),
+            flexibility_bonus=request.availability_requirements.flexibility * 0.2,
+            required_years=EXPERIENCE_YEARS.get(request.experience_level, 3),
+            skill_keys=[skill._name_key for skill in skills],
+            skill_levels=np.array([SKILL_LEVELS.get(skill.level, 2) for skill in skills], dtype=np.int64),
+            skill_weights=np.array([skill.weight for skill in skills], dtype=np.float64),
+            skill_mandatory=np.array([skill.mandatory for skill in skills], dtype=np.bool_),
+            total_skill_weight=float(sum(skill.weight for skill in skills))
+        )
+
 class MatchingService:
     """Core service for intelligent coach matching"""
     
@@ -39,109 +96,198 @@ class MatchingService:
         self.redis_service = RedisService()
         self.algorithm_version = Config.MATCHING_ALGORITHM_VERSION
         self.weights = Config.get_matching_weights()
-        self.last_processing_time = 0
+        self.weight_vector = np.array([
+            self.weights[component] for component in ('skills', 'experience', 'availability', 'price', 'rating')
+        ])
         self.coaches_cache: List[CoachProfile] = []
-        self.last_coach_refresh = datetime.min
-        
-        # Initialize ML components
-        self.tfidf_vectorizer = TfidfVectorizer(
-            max_features=1000,
-            stop_words='english',
-            ngram_range=(1, 2)
+        self.coach_pool = CoachPool.from_profiles([])
+        # Monotonic clock for refresh ages; wall-clock time is kept only for reporting
+        self.last_coach_refresh_monotonic = float('-inf')
+        self.last_coach_refresh_wall: Optional[datetime] = None
+        self._refresh_lock = threading.Lock()
+        
+        # Keep-alive session so coach refreshes reuse pooled backend connections
+        self._http = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=4,
+            pool_maxsize=8,
+            max_retries=Retry(total=2, backoff_factor=0.1)
         )
-        self.scaler = MinMaxScaler()
+        self._http.mount('http://', adapter)
+        self._http.mount('https://', adapter)
         
-        # Statistics
+        # Statistics, updated from concurrent consumer workers under a lock
+        self._stats_lock = threading.Lock()
         self.total_requests_processed = 0
         self.total_matches_generated = 0
         self.average_processing_time = 0.0
         
         logger.info("Matching service initialized")
     
-    def find_matches(self, request: MatchingRequest) -> List[MatchResult]:
-        """Find the best matching coaches for a request"""
+    def find_matches(self, request: MatchingRequest) -> Tuple[List[MatchResult], int]:
+        """Find the best matching coaches for a request, with the processing time in milliseconds"""
         start_time = time.time()
         
         try:
             logger.info(f"Starting matching for request {request.request_id}")
             
             # Get available coaches
-            coaches = self._get_available_coaches()
+            pool = self._get_coach_pool()
+            coaches = pool.coaches
             
             if not coaches:
                 logger.warning("No coaches available for matching")
-                return []
+                return [], int((time.time() - start_time) * 1000)
             
             # Pre-filter coaches based on hard constraints
-            filtered_coaches = self._apply_hard_filters(coaches, request)
-            logger.info(f"Filtered to {len(filtered_coaches)} coaches after hard constraints")
+            context = RequestContext.from_request(request)
+            filtered_idx = self._apply_hard_filters(pool, context)
+            logger.info(f"Filtered to {len(filtered_idx)} coaches after hard constraints")
             
-            if not filtered_coaches:
+            if len(filtered_idx) == 0:
                 logger.warning("No coaches passed hard filters")
-                return []
+                return [], int((time.time() - start_time) * 1000)
+            
+            # Serve identical requests against the same coach data from Redis
+            cache_key = self._match_cache_key(request, pool)
+            cached_matches = self.redis_service.get_cached_matches(cache_key)
+            if cached_matches is not None:
+                match_results = [MatchResult.model_validate(match) for match in cached_matches]
+                logger.info(f"Match cache hit for request {request.request_id}")
+                return self._complete_matching(request, len(coaches), match_results, cached_matches, start_time)
             
-            # Calculate match scores for each coach
+            # Score the filtered coaches in one batched pass
+            filtered_idx, scores = self._score_batch(pool, filtered_idx, context)
+            
+            # Keep coaches above the minimum score and rank only the best few
+            eligible = np.flatnonzero(scores[:, 0] >= Config.MIN_MATCH_SCORE)
+            ranked = eligible[self._select_top_k(scores[eligible, 0], Config.MAX_MATCHES_PER_REQUEST)]
+            
+            # Build full results only for the ranked coaches
             match_results = []
-            for coach in filtered_coaches:
+            for coach_idx, coach_scores in zip(filtered_idx[ranked].tolist(), scores[ranked].tolist()):
+                coach = coaches[coach_idx]
                 try:
-                    match_result = self._calculate_match_score(coach, request)
-                    if match_result.match_score >= Config.MIN_MATCH_SCORE:
-                        match_results.append(match_result)
+                    match_results.append(self._materialize_match_result(coach, request, *coach_scores))
                 except Exception as e:
                     logger.error(f"Error calculating match for coach {coach.coach_id}: {e}")
             
-            # Sort by match score (descending)
-            match_results.sort(key=lambda x: x.match_score, reverse=True)
-            
-            # Limit results
-            match_results = match_results[:Config.MAX_MATCHES_PER_REQUEST]
-            
-            # Calculate processing time
-            processing_time = int((time.time() - start_time) * 1000)
-            self.last_processing_time = processing_time
-            
-            # Update statistics
-            self._update_statistics(len(coaches), len(match_results), processing_time)
-            
-            # Cache results
-            self._cache_results(request.request_id, match_results)
+            # Dump once to JSON-ready dicts for both cache writes
+            match_dicts = [result.model_dump(mode='json') for result in match_results]
+            self.redis_service.cache_matches(cache_key, match_dicts)
             
-            logger.info(f"Matching completed: {len(match_results)} matches found in {processing_time}ms")
-            return match_results
+            return self._complete_matching(request, len(coaches), match_results, match_dicts, start_time)
             
         except Exception as e:
             logger.error(f"Matching failed for request {request.request_id}: {e}")
             raise
     
+    def _complete_matching(self, request: MatchingRequest, total_coaches: int,
+                           match_results: List[MatchResult], match_dicts: List[Dict[str, Any]],
+                           start_time: float) -> Tuple[List[MatchResult], int]:
+        """Record timing and statistics and cache results for a finished match"""
+        # Calculate processing time
+        processing_time = int((time.time() - start_time) * 1000)
+        
+        # Update statistics
+        self._update_statistics(total_coaches, len(match_results), processing_time)
+        
+        # Cache results
+        self._cache_results(request.request_id, match_dicts)
+        
+        logger.info(f"Matching completed: {len(match_results)} matches found in {processing_time}ms")
+        return match_results, processing_time
+    
+    def _match_cache_key(self, request: MatchingRequest, pool: CoachPool) -> str:
+        """Build a deterministic cache key from everything that affects a request's matches against a pool"""
+        normalized = {
+            'coach_data_version': pool.data_version,
+            'skills': [
+                (skill.name, skill.level, skill.weight, skill.mandatory)
+                for skill in request.skills_required
+            ],
+            'experience_level': request.experience_level,
+            'session_type': request.session_type,
+            'max_hourly_rate': request.budget_constraints.max_hourly_rate,
+            'days_of_week': sorted(set(request.availability_requirements.days_of_week)),
+            'flexibility': request.availability_requirements.flexibility,
+            'languages': sorted(set(request.preferred_languages)),
+            'participants_count': request.participants_count
+        }
+        digest = hashlib.sha1(orjson.dumps(normalized, option=orjson.OPT_SORT_KEYS)).hexdigest()
+        return MATCH_CACHE_KEY_PREFIX + digest
+    
     def _get_available_coaches(self) -> List[CoachProfile]:
         """Get list of available coaches"""
+        return self._get_coach_pool().coaches
+    
+    def _get_coach_pool(self) -> CoachPool:
+        """Get the scoring pool of available coaches"""
         try:
-            # Check if we need to refresh coach data
-            if self._should_refresh_coaches():
-                self._refresh_coach_data()
+            # Serve stale data while a background refresh runs; only block when it is too old
+            age = self._coach_data_age()
+            if age > Config.COACH_DATA_STALE_TTL or (not self.coaches_cache and self._should_refresh_coaches()):
+                with self._refresh_lock:
+                    if self._should_refresh_coaches():
+                        self._refresh_coach_data()
+            elif age > Config.REFRESH_COACH_DATA_INTERVAL:
+                self._start_background_refresh()
             
-            return [coach for coach in self.coaches_cache if coach.is_active and coach.can_accept_new_clients]
+            return self.coach_pool
             
         except Exception as e:
             logger.error(f"Failed to get available coaches: {e}")
-            return []
+            return CoachPool.from_profiles([])
+    
+    def _build_coach_pool(self, data_version: int):
+        """Project available coaches from the cache into the scoring pool"""
+        pool = CoachPool.from_profiles([
+            coach for coach in self.coaches_cache if coach.is_active and coach.can_accept_new_clients
+        ])
+        # The version travels with the pool so cached matches are keyed on the data they were scored on
+        pool.data_version = data_version
+        self.coach_pool = pool
+    
+    def _coach_data_age(self) -> float:
+        """Seconds since coach data was last refreshed"""
+        return time.monotonic() - self.last_coach_refresh_monotonic
     
     def _should_refresh_coaches(self) -> bool:
         """Check if coach data needs to be refreshed"""
-        time_since_refresh = datetime.utcnow() - self.last_coach_refresh
-        return time_since_refresh.total_seconds() > Config.REFRESH_COACH_DATA_INTERVAL
+        return self._coach_data_age() > Config.REFRESH_COACH_DATA_INTERVAL
+    
+    def _start_background_refresh(self):
+        """Refresh coach data on a background thread unless a refresh is already running"""
+        if not self._refresh_lock.acquire(blocking=False):
+            return
+        
+        try:
+            threading.Thread(target=self._background_refresh, name='coach-refresh', daemon=True).start()
+        except Exception:
+            self._refresh_lock.release()
+            raise
+    
+    def _background_refresh(self):
+        """Run a coach data refresh and release the refresh lock"""
+        try:
+            self._refresh_coach_data()
+        finally:
+            self._refresh_lock.release()
     
     def _refresh_coach_data(self):
         """Refresh coach data from backend API and cache"""
         try:
             logger.info("Refreshing coach data")
             
+            # Coach writes bump this version, which retires cached matches
+            data_version = self.redis_service.get_counter(COACH_DATA_VERSION_KEY)
+            
             # Try to get from cache first
             cached_coaches = self.redis_service.get_all_coaches()
             
             if cached_coaches:
                 self.coaches_cache = [
-                    CoachProfile(**coach) for coach in cached_coaches
+                    CoachProfile.model_validate(coach) for coach in cached_coaches
                 ]
                 logger.info(f"Loaded {len(self.coaches_cache)} coaches from cache")
             else:
@@ -149,27 +295,32 @@ class MatchingService:
                 self.coaches_cache = self._fetch_coaches_from_api()
                 
                 # Cache the data
-                for coach in self.coaches_cache:
-                    self.redis_service.set_coach_data(coach.coach_id, coach.dict())
+                self.redis_service.set_coaches_bulk(
+                    [(coach.coach_id, coach.model_dump()) for coach in self.coaches_cache]
+                )
+                data_version = self.redis_service.increment_counter(COACH_DATA_VERSION_KEY)
             
-            self.last_coach_refresh = datetime.utcnow()
+            self._build_coach_pool(data_version)
+            self.last_coach_refresh_monotonic = time.monotonic()
+            self.last_coach_refresh_wall = utc_now()
             
         except Exception as e:
             logger.error(f"Failed to refresh coach data: {e}")
             # Use existing cache if available
             if not self.coaches_cache:
                 self.coaches_cache = self._get_mock_coaches()
+                self._build_coach_pool(self.coach_pool.data_version)
     
     def _fetch_coaches_from_api(self) -> List[CoachProfile]:
         """Fetch coaches from backend API"""
         try:
-            response = requests.get(
+            response = self._http.get(
                 f"{Config.BACKEND_API_URL}/coaches",
                 timeout=10
             )
             
             if response.status_code == 200:
-                data = response.json()
+                data = orjson.loads(response.content)
                 coaches_data = data.get('data', [])
                 
                 coaches = []
@@ -341,67 +492,85 @@ class MatchingService:
             )
         ]
     
-    def _apply_hard_filters(self, coaches: List[CoachProfile], request: MatchingRequest) -> List[CoachProfile]:
-        """Apply hard constraints to filter coaches"""
-        filtered_coaches = []
+    def _apply_hard_filters(self, pool: CoachPool, context: RequestContext) -> np.ndarray:
+        """Apply hard constraints and return pool indices of the surviving coaches"""
+        # Check session type compatibility
+        mask = (pool.session_mask & context.session_mask) != 0
         
-        for coach in coaches:
-            # Check session type compatibility
-            if request.session_type not in coach.session_types:
-                continue
-            
-            # Check budget constraints
-            if (request.budget_constraints.max_hourly_rate and 
-                coach.hourly_rate > request.budget_constraints.max_hourly_rate):
-                continue
-            
-            # Check participant capacity
-            if coach.max_participants < request.participants_count:
-                continue
-            
-            # Check language requirements
-            if not any(lang in coach.languages for lang in request.preferred_languages):
-                continue
-            
-            # Check availability overlap
-            if not self._has_availability_overlap(coach, request):
-                continue
-            
-            filtered_coaches.append(coach)
-        
-        return filtered_coaches
-    
-    def _has_availability_overlap(self, coach: CoachProfile, request: MatchingRequest) -> bool:
-        """Check if coach availability overlaps with request requirements"""
-        request_days = set(request.availability_requirements.days_of_week)
-        coach_days = set(avail['day_of_week'] for avail in coach.availability)
-        
-        # Check if there's any day overlap
-        return bool(request_days.intersection(coach_days))
-    
-    def _calculate_match_score(self, coach: CoachProfile, request: MatchingRequest) -> MatchResult:
-        """Calculate comprehensive match score for a coach"""
-        
-        # Calculate individual scores
-        skill_score = self._calculate_skill_score(coach, request)
-        experience_score = self._calculate_experience_score(coach, request)
-        availability_score = self._calculate_availability_score(coach, request)
-        price_score = self._calculate_price_score(coach, request)
-        rating_score = self._calculate_rating_score(coach)
-        
-        # Calculate weighted overall score
-        overall_score = (
-            skill_score * self.weights['skills'] +
-            experience_score * self.weights['experience'] +
-            availability_score * self.weights['availability'] +
-            price_score * self.weights['price'] +
-            rating_score * self.weights['rating']
+        # Check budget constraints
+        if context.max_rate:
+            mask &= pool.hourly_rate <= context.max_rate
+        
+        # Check participant capacity
+        mask &= pool.max_participants >= context.participants_count
+        
+        # Check language requirements
+        mask &= (pool.language_bits & pool.language_words(context.language_mask)).any(axis=1)
+        
+        # Check availability overlap
+        mask &= self._availability_overlap_bits(pool.day_mask, context) != 0
+        
+        return np.flatnonzero(mask)
+    
+    def _select_top_k(self, scores: np.ndarray, k: int) -> np.ndarray:
+        """Positions of the k highest scores in descending order, ties kept in input order"""
+        if len(scores) > k > 0:
+            # Partition around the k-th highest score, then keep only as many ties as fit
+            kth_score = np.partition(scores, len(scores) - k)[len(scores) - k]
+            above = np.flatnonzero(scores > kth_score)
+            ties = np.flatnonzero(scores == kth_score)[:k - len(above)]
+            top = np.concatenate((above, ties))
+        else:
+            top = np.arange(len(scores))[:max(k, 0)]
+        
+        return top[np.argsort(-scores[top], kind='stable')]
+    
+    def _score_batch(self, pool: CoachPool, filtered_idx: np.ndarray,
+                     context: RequestContext) -> Tuple[np.ndarray, np.ndarray]:
+        """Score the filtered coaches that can still make the cut
+
+        Returns the surviving pool indices and one row per survivor in _materialize_match_result argument order.
+        """
+        rows = scoring.component_rows(
+            filtered_idx.astype(np.int64, copy=False),
+            pool.total_experience_years, pool.day_mask, DAY_POPCOUNT,
+            pool.hourly_rate, pool.rating_score,
+            context.required_years, context.day_mask, context.day_count, context.flexibility_bonus,
+            float(context.max_rate or 0.0), context.value_rate
         )
         
+        # Only run the skill pass for coaches whose best case can still rank
+        candidates = self._bound_candidates(rows, Config.MIN_MATCH_SCORE, Config.MAX_MATCHES_PER_REQUEST)
+        rows = rows[candidates]
+        filtered_idx = filtered_idx[candidates]
+        
+        skill_scores = self._calculate_skill_scores(pool, filtered_idx, context)
+        scoring.complete_rows(rows, skill_scores, self.weight_vector)
+        return filtered_idx, rows
+    
+    def _bound_candidates(self, rows: np.ndarray, min_score: float, k: int) -> np.ndarray:
+        """Positions of coaches that could reach the minimum score and the top k, whatever their skill score"""
+        # Skill scores lie in [0, 1], which bounds each coach's overall score
+        weights = self.weight_vector
+        rest = rows[:, 2:6] @ weights[1:]
+        upper = np.minimum(rest + weights[0], 1.0)
+        threshold = min_score
+        
+        # k coaches are guaranteed at least their k-th best lower bound, so anyone below it cannot rank
+        if len(rows) > k > 0:
+            lower = np.minimum(rest, 1.0)
+            threshold = max(threshold, np.partition(lower, len(lower) - k)[len(lower) - k])
+        
+        # Tolerance absorbs rounding differences between the bound and the scoring kernels
+        return np.flatnonzero(upper >= threshold - SCORE_BOUND_TOLERANCE)
+    
+    def _materialize_match_result(self, coach: CoachProfile, request: MatchingRequest, overall_score: float,
+                               skill_score: float, experience_score: float, availability_score: float,
+                               price_score: float, rating_score: float, availability_overlap: float) -> MatchResult:
+        """Build the match result for a ranked coach from its precomputed scores"""
+        
         # Generate match details
-        matching_skills = self._get_matching_skills(coach, request)
-        missing_skills = self._get_missing_skills(coach, request)
-        availability_overlap = self._calculate_availability_overlap(coach, request)
+        matching_skills, missing_skills = self._split_skills(coach, request)
         price_difference = self._calculate_price_difference(coach, request)
         
         # Generate recommendation reason
@@ -414,9 +583,10 @@ class MatchingService:
             skill_score, experience_score, availability_score, coach
         )
         
-        return MatchResult(
+        # Scores come out of the kernels already bounded, so skip re-validating them
+        return MatchResult.model_construct(
             coach=coach,
-            match_score=min(overall_score, 1.0),
+            match_score=overall_score,
             skill_score=skill_score,
             experience_score=experience_score,
             availability_score=availability_score,
@@ -430,170 +600,48 @@ class MatchingService:
             recommendation_reason=recommendation_reason
         )
     
-    def _calculate_skill_score(self, coach: CoachProfile, request: MatchingRequest) -> float:
-        """Calculate skill matching score"""
-        if not request.skills_required:
-            return 0.5  # Neutral score if no skills specified
-        
-        total_weight = sum(skill.weight for skill in request.skills_required)
-        if total_weight == 0:
-            return 0.5
-        
-        score = 0.0
-        for required_skill in request.skills_required:
-            # Find matching coach skill
-            coach_skill = self._find_coach_skill(coach, required_skill.name)
-            
-            if coach_skill:
-                # Calculate skill level match
-                level_score = self._calculate_skill_level_match(
-                    coach_skill['level'], required_skill.level
-                )
-                
-                # Consider experience years
-                exp_bonus = min(coach_skill['years_experience'] / 5.0, 0.2)
-                
-                skill_score = min(level_score + exp_bonus, 1.0)
-                score += skill_score * required_skill.weight
-            elif required_skill.mandatory:
-                # Mandatory skill missing - significantly reduce score
-                score -= 0.5 * required_skill.weight
-        
-        return max(score / total_weight, 0.0)
-    
-    def _find_coach_skill(self, coach: CoachProfile, skill_name: str) -> Optional[Dict[str, Any]]:
-        """Find a specific skill in coach's skill set"""
-        skill_name_lower = skill_name.lower()
-        for skill in coach.skills:
-            if skill['name'].lower() == skill_name_lower:
-                return skill
-        return None
-    
-    def _calculate_skill_level_match(self, coach_level: ExpertiseLevel, required_level: ExpertiseLevel) -> float:
-        """Calculate match score based on skill levels"""
-        level_map = {
-            ExpertiseLevel.BEGINNER: 1,
-            ExpertiseLevel.INTERMEDIATE: 2,
-            ExpertiseLevel.EXPERT: 3,
-            ExpertiseLevel.MASTER: 4
-        }
-        
-        coach_level_num = level_map.get(coach_level, 2)
-        required_level_num = level_map.get(required_level, 2)
-        
-        if coach_level_num >= required_level_num:
-            # Coach exceeds or meets requirement
-            return 1.0
-        else:
-            # Coach is below requirement
-            return coach_level_num / required_level_num
-    
-    def _calculate_experience_score(self, coach: CoachProfile, request: MatchingRequest) -> float:
-        """Calculate experience matching score"""
-        level_map = {
-            ExpertiseLevel.BEGINNER: 1,
-            ExpertiseLevel.INTERMEDIATE: 3,
-            ExpertiseLevel.EXPERT: 6,
-            ExpertiseLevel.MASTER: 10
-        }
-        
-        required_years = level_map.get(request.experience_level, 3)
-        
-        if coach.total_experience_years >= required_years:
-            # Calculate bonus for additional experience
-            bonus = min((coach.total_experience_years - required_years) / 10.0, 0.3)
-            return min(1.0 + bonus, 1.0)
-        else:
-            # Partial credit for partial experience
-            return coach.total_experience_years / required_years
-    
-    def _calculate_availability_score(self, coach: CoachProfile, request: MatchingRequest) -> float:
-        """Calculate availability matching score"""
-        if not coach.availability or not request.availability_requirements.days_of_week:
-            return 0.5
-        
-        request_days = set(request.availability_requirements.days_of_week)
-        coach_days = set(avail['day_of_week'] for avail in coach.availability)
-        
-        overlap_days = request_days.intersection(coach_days)
-        
-        if not overlap_days:
-            return 0.0
-        
-        # Calculate overlap ratio
-        overlap_ratio = len(overlap_days) / len(request_days)
-        
-        # Apply flexibility factor
-        flexibility_bonus = request.availability_requirements.flexibility * 0.2
-        
-        return min(overlap_ratio + flexibility_bonus, 1.0)
-    
-    def _calculate_price_score(self, coach: CoachProfile, request: MatchingRequest) -> float:
-        """Calculate price compatibility score"""
-        if not request.budget_constraints.max_hourly_rate:
-            return 0.5  # Neutral if no budget specified
-        
-        max_rate = request.budget_constraints.max_hourly_rate
-        coach_rate = coach.hourly_rate
-        
-        if coach_rate <= max_rate:
-            # Within budget - higher score for better value
-            if coach_rate <= max_rate * 0.8:
-                return 1.0  # Great value
-            else:
-                return 0.8  # Acceptable
-        else:
-            # Over budget - score based on how much over
-            overage_ratio = (coach_rate - max_rate) / max_rate
-            return max(0.0, 0.5 - overage_ratio)
+    def _calculate_skill_scores(self, pool: CoachPool, filtered_idx: np.ndarray,
+                                context: RequestContext) -> np.ndarray:
+        """Calculate skill matching scores for the filtered coaches"""
+        if not context.skill_keys:
+            return np.full(len(filtered_idx), 0.5)  # Neutral score if no skills specified
+        
+        if context.total_skill_weight == 0:
+            return np.full(len(filtered_idx), 0.5)
+        
+        # Pull only the required skill columns for the filtered rows
+        cols = [pool.skill_vocab.get(key) for key in context.skill_keys]
+        known_cols = sorted(set(col for col in cols if col is not None))
+        position = {col: i for i, col in enumerate(known_cols)}
+        rows_cols = np.ix_(filtered_idx, known_cols)
+        levels = pool.level_matrix[rows_cols]
+        years = pool.years_matrix[rows_cols]
+        
+        return scoring.skill_scores(
+            levels, years,
+            np.array([position[col] if col is not None else -1 for col in cols], dtype=np.int64),
+            context.skill_levels,
+            context.skill_weights,
+            context.skill_mandatory,
+            context.total_skill_weight
+        )
     
-    def _calculate_rating_score(self, coach: CoachProfile) -> float:
-        """Calculate rating-based score"""
-        if coach.rating == 0:
-            return 0.5  # Neutral for new coaches
-        
-        # Normalize rating (0-5 scale to 0-1 scale)
-        base_score = coach.rating / 5.0
-        
-        # Bonus for high session count (reliability indicator)
-        session_bonus = min(coach.total_sessions / 100.0, 0.2)
-        
-        # Bonus for high success rate
-        success_bonus = coach.success_rate * 0.1
-        
-        return min(base_score + session_bonus + success_bonus, 1.0)
+    def _availability_overlap_bits(self, coach_day_masks: np.ndarray, context: RequestContext) -> np.ndarray:
+        """Number of requested days each coach is available on"""
+        return DAY_POPCOUNT[coach_day_masks & context.day_mask]
     
-    def _get_matching_skills(self, coach: CoachProfile, request: MatchingRequest) -> List[str]:
-        """Get list of skills that match between coach and request"""
+    def _split_skills(self, coach: CoachProfile, request: MatchingRequest) -> Tuple[List[str], List[str]]:
+        """Split required skills into those the coach has and those it is missing"""
         matching_skills = []
-        
-        for required_skill in request.skills_required:
-            if self._find_coach_skill(coach, required_skill.name):
-                matching_skills.append(required_skill.name)
-        
-        return matching_skills
-    
-    def _get_missing_skills(self, coach: CoachProfile, request: MatchingRequest) -> List[str]:
-        """Get list of required skills that coach doesn't have"""
         missing_skills = []
         
         for required_skill in request.skills_required:
-            if not self._find_coach_skill(coach, required_skill.name):
+            if required_skill._name_key in coach._skill_index:
+                matching_skills.append(required_skill.name)
+            else:
                 missing_skills.append(required_skill.name)
         
-        return missing_skills
-    
-    def _calculate_availability_overlap(self, coach: CoachProfile, request: MatchingRequest) -> float:
-        """Calculate percentage of availability overlap"""
-        if not request.availability_requirements.days_of_week:
-            return 0.0
-        
-        request_days = set(request.availability_requirements.days_of_week)
-        coach_days = set(avail['day_of_week'] for avail in coach.availability)
-        
-        overlap_days = request_days.intersection(coach_days)
-        
-        return len(overlap_days) / len(request_days) if request_days else 0.0
+        return matching_skills, missing_skills
     
     def _calculate_price_difference(self, coach: CoachProfile, request: MatchingRequest) -> float:
         """Calculate price difference percentage"""
@@ -645,14 +693,15 @@ class MatchingService:
     
     def _update_statistics(self, total_coaches: int, matches_found: int, processing_time: int):
         """Update service statistics"""
-        self.total_requests_processed += 1
-        self.total_matches_generated += matches_found
-        
-        # Update average processing time
-        self.average_processing_time = (
-            (self.average_processing_time * (self.total_requests_processed - 1) + processing_time) 
-            / self.total_requests_processed
-        )
+        with self._stats_lock:
+            self.total_requests_processed += 1
+            self.total_matches_generated += matches_found
+            
+            # Update average processing time
+            self.average_processing_time = (
+                (self.average_processing_time * (self.total_requests_processed - 1) + processing_time) 
+                / self.total_requests_processed
+            )
         
         # Store statistics in Redis
         stats = {
@@ -664,12 +713,12 @@ class MatchingService:
         
         self.redis_service.store_processing_stats(stats)
     
-    def _cache_results(self, request_id: str, results: List[MatchResult]):
+    def _cache_results(self, request_id: str, match_dicts: List[Dict[str, Any]]):
         """Cache matching results"""
         try:
             cache_data = {
-                'matches': [result.dict() for result in results],
-                'generated_at': datetime.utcnow().isoformat(),
+                'matches': match_dicts,
+                'generated_at': utc_now().isoformat(),
                 'algorithm_version': self.algorithm_version
             }
             
@@ -690,27 +739,23 @@ class MatchingService:
             'average_processing_time_ms': self.average_processing_time,
             'algorithm_version': self.algorithm_version,
             'cache_info': self.redis_service.get_cache_info(),
-            'active_coaches': len(self._get_available_coaches())
+            'active_coaches': len(self._get_coach_pool()),
+            'last_coach_refresh': self.last_coach_refresh_wall.isoformat() if self.last_coach_refresh_wall else None
         }
     
-    def get_last_processing_time(self) -> int:
-        """Get last processing time in milliseconds"""
-        return self.last_processing_time
-    
     def get_algorithm_version(self) -> str:
         """Get algorithm version"""
         return self.algorithm_version
     
     def get_current_timestamp(self) -> str:
         """Get current timestamp as ISO string"""
-        return datetime.utcnow().isoformat()
+        return utc_now().isoformat()
     
     def is_healthy(self) -> bool:
         """Check if matching service is healthy"""
         try:
-            # Check if we have coaches available
-            coaches = self._get_available_coaches()
-            return len(coaches) > 0
+            # Check if we have coaches available; the pool only holds active coaches
+            return len(self._get_coach_pool()) > 0
         except Exception as e:
             logger.error(f"Health check failed: {e}")
             return False
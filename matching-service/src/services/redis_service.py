@@ -2,36 +2,140 @@
 Redis service for caching coach data and matching results
 """
 
-import json
+import atexit
+import functools
 import logging
+import os
+import queue
+import socket
+import threading
+import time
+import orjson
 import redis
-from typing import Optional, Dict, Any, List
-from datetime import datetime, timedelta
+import zstandard
+from typing import Optional, Dict, Any, Iterator, List, Tuple
 from src.config.settings import Config
 
 logger = logging.getLogger(__name__)
 
+# Connection pool shared by every RedisService in the process
+_connection_pool: Optional[redis.BlockingConnectionPool] = None
+_connection_pool_lock = threading.Lock()
+
+def _get_connection_pool() -> redis.BlockingConnectionPool:
+    """Create the process-wide Redis connection pool on first use"""
+    global _connection_pool
+    if _connection_pool is None:
+        with _connection_pool_lock:
+            if _connection_pool is None:
+                keepalive_options = {socket.TCP_KEEPIDLE: 30} if hasattr(socket, 'TCP_KEEPIDLE') else None
+                _connection_pool = redis.BlockingConnectionPool(
+                    host=Config.REDIS_HOST,
+                    port=Config.REDIS_PORT,
+                    db=Config.REDIS_DB,
+                    password=Config.REDIS_PASSWORD,
+                    decode_responses=False,
+                    max_connections=Config.REDIS_MAX_CONNECTIONS,
+                    timeout=5,
+                    socket_connect_timeout=5,
+                    socket_timeout=5,
+                    socket_keepalive=True,
+                    socket_keepalive_options=keepalive_options,
+                    retry_on_timeout=True,
+                    health_check_interval=30
+                )
+    return _connection_pool
+
+def _dumps(value: Any) -> bytes:
+    """Encode a cached value as compact JSON bytes; naive datetimes are UTC"""
+    return orjson.dumps(value, default=str, option=orjson.OPT_NAIVE_UTC)
+
+def _pack(value: Any) -> bytes:
+    """Encode a cached value, zstd-compressing it when it is large"""
+    blob = _dumps(value)
+    if len(blob) > COMPRESS_THRESHOLD:
+        return zstandard.compress(blob, COMPRESS_LEVEL)
+    return blob
+
+def _inflate(raw: bytes) -> bytes:
+    """JSON bytes of a cached value; compressed values are told apart by the zstd frame magic"""
+    if raw.startswith(zstandard.FRAME_HEADER):
+        return zstandard.decompress(raw)
+    return raw
+
+def _unpack(raw: bytes) -> Any:
+    """Decode a value written by _pack"""
+    return orjson.loads(_inflate(raw))
+
+def _unwrap(value: Any, field: str) -> Any:
+    """Payload of a cached value, unwrapping entries written with the old cached_at/ttl envelope"""
+    if isinstance(value, dict) and 'cached_at' in value and field in value:
+        return value[field]
+    return value
+
+# Failures a cache call degrades on: the server being unreachable, a corrupt cached payload or a
+# value that cannot be encoded (orjson.JSONEncodeError is a TypeError)
+CACHE_ERRORS = (redis.RedisError, orjson.JSONDecodeError, orjson.JSONEncodeError, zstandard.ZstdError)
+
+def _redis_safe(default: Any = None):
+    """Log cache failures and return a default instead of raising; callable defaults are called per failure"""
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            try:
+                return fn(*args, **kwargs)
+            except CACHE_ERRORS as e:
+                logger.error("%s failed: %s", fn.__name__, e)
+                return default() if callable(default) else default
+        return wrapper
+    return decorator
+
+# Key names and prefixes, built once instead of formatted per call
+COACH_KEY_PREFIX = "coach:"
+COACH_KEY_PATTERN = COACH_KEY_PREFIX + "*"
+MATCH_RESULT_KEY_PREFIX = "match_result:"
+MATCH_CACHE_KEY_PREFIX = "match:"
+STATS_KEY = "processing_stats:stream"
+COACH_DATA_VERSION_KEY = "coach_data_version"
+COUNTER_KEY_PREFIX = "ctr:"
+
+# Cached values above this many bytes are stored zstd-compressed
+COMPRESS_THRESHOLD = 1024
+COMPRESS_LEVEL = 3
+
+# Keys fetched or deleted per SCAN batch
+SCAN_BATCH_SIZE = 500
+
+# Processing stats waiting to be written, how many go out per pipeline, and how many the stream keeps
+STATS_QUEUE_SIZE = 10000
+STATS_BATCH_SIZE = 100
+STATS_STREAM_MAXLEN = 1000
+
+# Seconds flush waits for queued processing stats before giving up
+STATS_FLUSH_TIMEOUT = 5
+
 class RedisService:
     """Redis service for caching and temporary storage"""
     
     def __init__(self):
         self.redis_client: Optional[redis.Redis] = None
+        self._coach_ttl = Config.COACH_DATA_TTL
         self._init_client()
+        
+        # Processing stats are written off the request path by a background thread, started on
+        # first use in each process; threads do not survive a fork such as gunicorn --preload
+        self._stats_queue: Optional[queue.Queue] = None
+        self._stats_pid: Optional[int] = None
+        self._stats_lock = threading.Lock()
+        
+        # Write anything still queued when the process exits
+        atexit.register(self.flush)
     
     def _init_client(self):
         """Initialize Redis client"""
         try:
-            self.redis_client = redis.Redis(
-                host=Config.REDIS_HOST,
-                port=Config.REDIS_PORT,
-                db=Config.REDIS_DB,
-                password=Config.REDIS_PASSWORD,
-                decode_responses=True,
-                socket_connect_timeout=5,
-                socket_timeout=5,
-                retry_on_timeout=True,
-                health_check_interval=30
-            )
+            # Instances share one pool so concurrent requests spread over its connections
+            self.redis_client = redis.Redis(connection_pool=_get_connection_pool())
             
             # Test connection
             self.redis_client.ping()
@@ -41,256 +145,360 @@ class RedisService:
             logger.error(f"Failed to initialize Redis client: {e}")
             raise
     
+    def _scan_batches(self, pattern: str, count: int = SCAN_BATCH_SIZE) -> Iterator[List[bytes]]:
+        """Yield keys matching a pattern in batches without blocking the server like KEYS"""
+        batch = []
+        for key in self.redis_client.scan_iter(match=pattern, count=count):
+            batch.append(key)
+            if len(batch) >= count:
+                yield batch
+                batch = []
+        
+        if batch:
+            yield batch
+    
+    @_redis_safe(None)
     def get_coach_data(self, coach_id: str) -> Optional[Dict[str, Any]]:
         """Get cached coach data"""
-        try:
-            cache_key = f"coach:{coach_id}"
-            cached_data = self.redis_client.get(cache_key)
-            
-            if cached_data:
-                logger.debug(f"Cache hit for coach {coach_id}")
-                return json.loads(cached_data)
-            else:
-                logger.debug(f"Cache miss for coach {coach_id}")
-                return None
-                
-        except Exception as e:
-            logger.error(f"Failed to get coach data from cache: {e}")
+        cache_key = COACH_KEY_PREFIX + coach_id
+        cached_data = self.redis_client.get(cache_key)
+        
+        if cached_data:
+            logger.debug("Cache hit for coach %s", coach_id)
+            return _unwrap(_unpack(cached_data), 'data')
+        else:
+            logger.debug("Cache miss for coach %s", coach_id)
             return None
     
+    @_redis_safe(dict)
+    def get_coaches_data(self, coach_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Get cached data for many coaches in one MGET round trip"""
+        if not coach_ids:
+            return {}
+        
+        values = self.redis_client.mget([COACH_KEY_PREFIX + coach_id for coach_id in coach_ids])
+        coaches = {
+            coach_id: _unwrap(_unpack(cached_data), 'data')
+            for coach_id, cached_data in zip(coach_ids, values) if cached_data
+        }
+        
+        logger.debug("Cache hit for %s of %s coaches", len(coaches), len(coach_ids))
+        return coaches
+    
+    @_redis_safe(None)
     def set_coach_data(self, coach_id: str, coach_data: Dict[str, Any], ttl: int = None):
         """Cache coach data"""
-        try:
-            cache_key = f"coach:{coach_id}"
-            ttl = ttl or Config.COACH_DATA_TTL
-            
-            # Add metadata
-            cached_data = {
-                'data': coach_data,
-                'cached_at': datetime.utcnow().isoformat(),
-                'ttl': ttl
-            }
-            
-            self.redis_client.setex(
-                cache_key,
-                ttl,
-                json.dumps(cached_data, default=str)
-            )
-            
-            logger.debug(f"Cached coach data for {coach_id} (TTL: {ttl}s)")
-            
-        except Exception as e:
-            logger.error(f"Failed to cache coach data: {e}")
+        cache_key = COACH_KEY_PREFIX + coach_id
+        ttl = ttl or self._coach_ttl
+        
+        # Store the payload as is; expiry is tracked by Redis itself
+        self.redis_client.setex(
+            cache_key,
+            ttl,
+            _pack(coach_data)
+        )
+        
+        logger.debug("Cached coach data for %s (TTL: %ss)", coach_id, ttl)
+    
+    @_redis_safe(None)
+    def set_coaches_bulk(self, items: List[Tuple[str, Dict[str, Any]]], ttl: int = None):
+        """Cache many coaches in a single pipelined round trip"""
+        ttl = ttl or self._coach_ttl
+        
+        with self.redis_client.pipeline(transaction=False) as pipe:
+            for coach_id, coach_data in items:
+                pipe.setex(COACH_KEY_PREFIX + coach_id, ttl, _pack(coach_data))
+            pipe.execute()
+        
+        logger.debug("Cached %s coaches (TTL: %ss)", len(items), ttl)
     
+    @_redis_safe(list)
     def get_all_coaches(self) -> List[Dict[str, Any]]:
         """Get all cached coaches"""
-        try:
-            coach_keys = self.redis_client.keys("coach:*")
-            coaches = []
-            
-            for key in coach_keys:
-                cached_data = self.redis_client.get(key)
-                if cached_data:
-                    coach_data = json.loads(cached_data)
-                    coaches.append(coach_data.get('data', {}))
-            
-            logger.debug(f"Retrieved {len(coaches)} coaches from cache")
-            return coaches
-            
-        except Exception as e:
-            logger.error(f"Failed to get all coaches from cache: {e}")
-            return []
+        # Queue one MGET per scanned batch and read every value back in a single round trip
+        with self.redis_client.pipeline(transaction=False) as pipe:
+            for keys in self._scan_batches(COACH_KEY_PATTERN):
+                pipe.mget(keys)
+            batches = pipe.execute()
+        
+        # Values are stored as raw JSON, so splice them into one array and parse it in a single call
+        payload = b",".join(_inflate(cached_data) for values in batches for cached_data in values if cached_data)
+        coaches = [_unwrap(coach_data, 'data') for coach_data in orjson.loads(b"[" + payload + b"]")]
+        
+        logger.debug("Retrieved %s coaches from cache", len(coaches))
+        return coaches
     
+    @_redis_safe(None)
     def invalidate_coach_cache(self, coach_id: str = None):
         """Invalidate coach cache"""
-        try:
+        # UNLINK frees the values in the background on the Redis side
+        deleted = 0
+        with self.redis_client.pipeline(transaction=False) as pipe:
             if coach_id:
                 # Invalidate specific coach
-                cache_key = f"coach:{coach_id}"
-                self.redis_client.delete(cache_key)
-                logger.info(f"Invalidated cache for coach {coach_id}")
+                pipe.unlink(COACH_KEY_PREFIX + coach_id)
             else:
                 # Invalidate all coaches
-                coach_keys = self.redis_client.keys("coach:*")
-                if coach_keys:
-                    self.redis_client.delete(*coach_keys)
-                    logger.info(f"Invalidated cache for {len(coach_keys)} coaches")
-                
-        except Exception as e:
-            logger.error(f"Failed to invalidate coach cache: {e}")
+                for keys in self._scan_batches(COACH_KEY_PATTERN):
+                    pipe.unlink(*keys)
+                    deleted += len(keys)
+            
+            # Retire match results computed from the old coach data
+            pipe.incr(COACH_DATA_VERSION_KEY)
+            pipe.execute()
+        
+        if coach_id:
+            logger.info("Invalidated cache for coach %s", coach_id)
+        elif deleted:
+            logger.info("Invalidated cache for %s coaches", deleted)
     
+    @_redis_safe(None)
     def cache_matching_result(self, request_id: str, result: Dict[str, Any], ttl: int = 3600):
         """Cache matching result"""
-        try:
-            cache_key = f"match_result:{request_id}"
-            
-            cached_result = {
-                'result': result,
-                'cached_at': datetime.utcnow().isoformat(),
-                'ttl': ttl
-            }
-            
-            self.redis_client.setex(
-                cache_key,
-                ttl,
-                json.dumps(cached_result, default=str)
-            )
-            
-            logger.debug(f"Cached matching result for request {request_id}")
-            
-        except Exception as e:
-            logger.error(f"Failed to cache matching result: {e}")
+        cache_key = MATCH_RESULT_KEY_PREFIX + request_id
+        
+        self.redis_client.setex(
+            cache_key,
+            ttl,
+            _pack(result)
+        )
+        
+        logger.debug("Cached matching result for request %s", request_id)
     
+    @_redis_safe(None)
+    def record_match(self, request_id: str, result: Dict[str, Any], counter_key: str, ttl: int = 3600):
+        """Cache a matching result and bump a counter in one round trip
+
+        Prefer this over cache_matching_result followed by increment_counter.
+        """
+        with self.redis_client.pipeline(transaction=False) as pipe:
+            pipe.setex(MATCH_RESULT_KEY_PREFIX + request_id, ttl, _pack(result))
+            pipe.incr(counter_key)
+            pipe.execute()
+        
+        logger.debug("Recorded matching result for request %s", request_id)
+    
+    @_redis_safe(None)
     def get_matching_result(self, request_id: str) -> Optional[Dict[str, Any]]:
         """Get cached matching result"""
-        try:
-            cache_key = f"match_result:{request_id}"
-            cached_data = self.redis_client.get(cache_key)
-            
-            if cached_data:
-                result_data = json.loads(cached_data)
-                logger.debug(f"Cache hit for matching result {request_id}")
-                return result_data.get('result')
-            else:
-                logger.debug(f"Cache miss for matching result {request_id}")
-                return None
-                
-        except Exception as e:
-            logger.error(f"Failed to get matching result from cache: {e}")
+        cache_key = MATCH_RESULT_KEY_PREFIX + request_id
+        cached_data = self.redis_client.get(cache_key)
+        
+        if cached_data:
+            logger.debug("Cache hit for matching result %s", request_id)
+            return _unwrap(_unpack(cached_data), 'result')
+        else:
+            logger.debug("Cache miss for matching result %s", request_id)
             return None
     
+    @_redis_safe(None)
+    def get_cached_matches(self, cache_key: str) -> Optional[List[Dict[str, Any]]]:
+        """Get matches cached under a normalized request key"""
+        cached_data = self.redis_client.get(cache_key)
+        
+        if cached_data:
+            logger.debug("Cache hit for matches %s", cache_key)
+            return _unpack(cached_data)
+        else:
+            logger.debug("Cache miss for matches %s", cache_key)
+            return None
+    
+    @_redis_safe(None)
+    def cache_matches(self, cache_key: str, matches: List[Dict[str, Any]], ttl: int = None):
+        """Cache matches under a normalized request key"""
+        ttl = ttl or self._coach_ttl
+        
+        self.redis_client.setex(
+            cache_key,
+            ttl,
+            _pack(matches)
+        )
+        
+        logger.debug("Cached %s matches under %s (TTL: %ss)", len(matches), cache_key, ttl)
+    
     def store_processing_stats(self, stats: Dict[str, Any]):
-        """Store processing statistics"""
+        """Queue processing statistics for the background writer"""
         try:
-            # Use sorted set for time-series data
-            timestamp = datetime.utcnow().timestamp()
-            stats_key = "processing_stats"
-            
             # Store stats with timestamp
             stats_data = {
-                'timestamp': timestamp,
+                'timestamp': time.time(),
                 **stats
             }
             
-            self.redis_client.zadd(
-                stats_key,
-                {json.dumps(stats_data, default=str): timestamp}
-            )
-            
-            # Keep only last 1000 entries
-            self.redis_client.zremrangebyrank(stats_key, 0, -1001)
+            self._stats_writer_queue().put_nowait(stats_data)
             
-            logger.debug("Stored processing statistics")
+        except queue.Full:
+            logger.warning("Processing stats queue is full, dropping stats")
+    
+    def _stats_writer_queue(self) -> queue.Queue:
+        """Queue of the current process's stats writer, starting the writer if this process has none"""
+        if self._stats_pid != os.getpid():
+            with self._stats_lock:
+                if self._stats_pid != os.getpid():
+                    # A queue inherited across a fork has no thread draining it, so start afresh
+                    stats_queue = queue.Queue(maxsize=STATS_QUEUE_SIZE)
+                    threading.Thread(
+                        target=self._drain_stats, args=(stats_queue,), name='redis-stats-writer', daemon=True
+                    ).start()
+                    self._stats_queue = stats_queue
+                    self._stats_pid = os.getpid()
+        return self._stats_queue
+    
+    def _drain_stats(self, stats_queue: queue.Queue):
+        """Write queued processing stats in pipelined batches"""
+        stats_key = STATS_KEY
+        
+        while True:
+            batch = [stats_queue.get()]
+            while len(batch) < STATS_BATCH_SIZE:
+                try:
+                    batch.append(stats_queue.get_nowait())
+                except queue.Empty:
+                    break
             
-        except Exception as e:
-            logger.error(f"Failed to store processing stats: {e}")
+            try:
+                # Capped stream for time-series data; entry IDs carry the write time
+                with self.redis_client.pipeline(transaction=False) as pipe:
+                    for stats_data in batch:
+                        pipe.xadd(
+                            stats_key, {'data': _dumps(stats_data)},
+                            maxlen=STATS_STREAM_MAXLEN, approximate=True
+                        )
+                    pipe.execute()
+                
+                logger.debug("Stored %s processing statistics", len(batch))
+                
+            except Exception as e:
+                logger.error("Failed to store processing stats: %s", e)
+            finally:
+                for _ in batch:
+                    stats_queue.task_done()
+    
+    def flush(self, timeout: float = STATS_FLUSH_TIMEOUT):
+        """Wait up to timeout seconds for every queued processing stat to be written"""
+        stats_queue = self._stats_queue
+        if stats_queue is None or self._stats_pid != os.getpid():
+            return
+        
+        deadline = time.monotonic() + timeout
+        with stats_queue.all_tasks_done:
+            while stats_queue.unfinished_tasks:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    logger.warning("%s processing stats still unwritten after flush", stats_queue.unfinished_tasks)
+                    return
+                stats_queue.all_tasks_done.wait(remaining)
     
+    @_redis_safe(list)
     def get_processing_stats(self, hours: int = 24) -> List[Dict[str, Any]]:
         """Get processing statistics for the last N hours"""
-        try:
-            stats_key = "processing_stats"
-            
-            # Calculate time range
-            end_time = datetime.utcnow().timestamp()
-            start_time = end_time - (hours * 3600)
-            
-            # Get stats in time range
-            stats_data = self.redis_client.zrangebyscore(
-                stats_key, start_time, end_time
-            )
-            
-            stats_list = []
-            for data in stats_data:
-                try:
-                    stats_list.append(json.loads(data))
-                except json.JSONDecodeError:
-                    continue
-            
-            logger.debug(f"Retrieved {len(stats_list)} processing stats")
-            return stats_list
-            
-        except Exception as e:
-            logger.error(f"Failed to get processing stats: {e}")
-            return []
+        stats_key = STATS_KEY
+        
+        # Stream IDs start with the entry's epoch milliseconds
+        start_ms = int((time.time() - hours * 3600) * 1000)
+        
+        # Get stats in time range
+        entries = self.redis_client.xrange(stats_key, min=f"{start_ms}-0", max="+")
+        
+        stats_list = []
+        for _, fields in entries:
+            try:
+                stats_list.append(orjson.loads(fields[b'data']))
+            except (KeyError, orjson.JSONDecodeError):
+                continue
+        
+        logger.debug("Retrieved %s processing stats", len(stats_list))
+        return stats_list
     
+    @_redis_safe(0)
     def increment_counter(self, key: str, amount: int = 1) -> int:
         """Increment a counter"""
-        try:
-            return self.redis_client.incr(key, amount)
-        except Exception as e:
-            logger.error(f"Failed to increment counter {key}: {e}")
-            return 0
+        return self.redis_client.incr(key, amount)
     
+    @_redis_safe(0)
     def get_counter(self, key: str) -> int:
         """Get counter value"""
-        try:
-            value = self.redis_client.get(key)
-            return int(value) if value else 0
-        except Exception as e:
-            logger.error(f"Failed to get counter {key}: {e}")
-            return 0
+        value = self.redis_client.get(key)
+        return int(value) if value else 0
+    
+    @_redis_safe(0)
+    def increment_counter_field(self, namespace: str, field: str, amount: int = 1) -> int:
+        """Increment one counter in a namespace hash"""
+        return self.redis_client.hincrby(COUNTER_KEY_PREFIX + namespace, field, amount)
+    
+    @_redis_safe(dict)
+    def get_counters(self, namespace: str) -> Dict[str, int]:
+        """Get every counter in a namespace hash in one round trip"""
+        counters = self.redis_client.hgetall(COUNTER_KEY_PREFIX + namespace)
+        return {field.decode(): int(value) for field, value in counters.items()}
     
+    @_redis_safe(None)
     def set_flag(self, key: str, value: bool = True, ttl: int = None):
         """Set a boolean flag"""
-        try:
-            if ttl:
-                self.redis_client.setex(key, ttl, "1" if value else "0")
-            else:
-                self.redis_client.set(key, "1" if value else "0")
-        except Exception as e:
-            logger.error(f"Failed to set flag {key}: {e}")
+        if not value:
+            # A missing flag reads as False, so clearing it frees the key
+            self.redis_client.delete(key)
+        elif ttl:
+            self.redis_client.setex(key, ttl, b"1")
+        else:
+            self.redis_client.set(key, b"1")
     
-    def get_flag(self, key: str) -> bool:
-        """Get boolean flag"""
-        try:
+    @_redis_safe(False)
+    def get_flag(self, key: str, refresh_ttl: int = None) -> bool:
+        """Get boolean flag, optionally extending its TTL in the same round trip"""
+        if refresh_ttl:
+            value = self.redis_client.getex(key, ex=refresh_ttl)
+        else:
             value = self.redis_client.get(key)
-            return value == "1" if value else False
-        except Exception as e:
-            logger.error(f"Failed to get flag {key}: {e}")
-            return False
+        return value == b"1"
     
+    @_redis_safe(False)
     def is_healthy(self) -> bool:
         """Check if Redis service is healthy"""
-        try:
-            if not self.redis_client:
-                return False
-            
-            # Test with ping
-            self.redis_client.ping()
-            return True
-            
-        except Exception as e:
-            logger.error(f"Redis health check failed: {e}")
+        if not self.redis_client:
             return False
+        
+        # Test with ping
+        self.redis_client.ping()
+        return True
     
+    @_redis_safe(None)
     def clear_all_cache(self):
         """Clear all cache (use with caution)"""
-        try:
-            self.redis_client.flushdb()
-            logger.warning("All cache data has been cleared")
-        except Exception as e:
-            logger.error(f"Failed to clear cache: {e}")
+        self.redis_client.flushdb()
+        logger.warning("All cache data has been cleared")
     
+    @_redis_safe(dict)
     def get_cache_info(self) -> Dict[str, Any]:
         """Get cache information and statistics"""
-        try:
-            info = self.redis_client.info()
-            
-            # Get key counts by pattern
-            coach_count = len(self.redis_client.keys("coach:*"))
-            match_count = len(self.redis_client.keys("match_result:*"))
+        # INFO rides along with the first SCAN page in one round trip
+        with self.redis_client.pipeline(transaction=False) as pipe:
+            pipe.info()
+            pipe.scan(0, count=SCAN_BATCH_SIZE)
+            info, (cursor, keys) = pipe.execute()
+        
+        # Tally both prefixes in a single walk; SCAN visits the whole keyspace whatever its MATCH
+        coach_prefix = COACH_KEY_PREFIX.encode()
+        match_prefix = MATCH_RESULT_KEY_PREFIX.encode()
+        coach_count = match_count = 0
+        while True:
+            for key in keys:
+                if key.startswith(coach_prefix):
+                    coach_count += 1
+                elif key.startswith(match_prefix):
+                    match_count += 1
             
-            return {
-                'redis_version': info.get('redis_version'),
-                'used_memory': info.get('used_memory_human'),
-                'connected_clients': info.get('connected_clients'),
-                'total_commands_processed': info.get('total_commands_processed'),
-                'cache_counts': {
-                    'coaches': coach_count,
-                    'match_results': match_count
-                }
+            if not cursor:
+                break
+            cursor, keys = self.redis_client.scan(cursor, count=SCAN_BATCH_SIZE)
+        
+        return {
+            'redis_version': info.get('redis_version'),
+            'used_memory': info.get('used_memory_human'),
+            'connected_clients': info.get('connected_clients'),
+            'total_commands_processed': info.get('total_commands_processed'),
+            'cache_counts': {
+                'coaches': coach_count,
+                'match_results': match_count
             }
-            
-        except Exception as e:
-            logger.error(f"Failed to get cache info: {e}")
-            return {}
+        }
@@ -0,0 +1,119 @@
+"""
+Numba kernels for scoring coaches over the CoachPool arrays
+"""
+
+import numpy as np
+from numba import config, njit, prange
+
+# Kafka consumer workers call the parallel kernels concurrently, which the workqueue
+# layer aborts on; unless a layer was chosen explicitly, require a thread-safe one (tbb or omp)
+if config.THREADING_LAYER == 'default':
+    config.THREADING_LAYER = 'threadsafe'
+
+# Explicit signatures compile the kernels at import time instead of on the first request.
+# No kernel uses fastmath: reassociation and FMA contraction change results in the last
+# bit, which moves scores across the recommendation thresholds and reorders tied coaches.
+
+@njit(
+    'float64[:](int8[:, :], int16[:, :], int64[:], int64[:], float64[:], boolean[:], float64)',
+    parallel=True, cache=True
+)
+def skill_scores(levels, years, skill_cols, required_levels, weights, mandatory, total_weight):
+    """Weighted skill match score per coach; a skill column of -1 means no coach has it"""
+    n_coaches = levels.shape[0]
+    scores = np.empty(n_coaches)
+
+    for i in prange(n_coaches):
+        score = 0.0
+        for k in range(skill_cols.shape[0]):
+            col = skill_cols[k]
+            level = levels[i, col] if col >= 0 else 0
+
+            if level > 0:
+                # Coach meeting the requirement scores fully, otherwise partial credit
+                if level >= required_levels[k]:
+                    level_score = 1.0
+                else:
+                    level_score = level / required_levels[k]
+
+                # Consider experience years
+                exp_bonus = min(years[i, col] / 5.0, 0.2)
+                score += min(level_score + exp_bonus, 1.0) * weights[k]
+            elif mandatory[k]:
+                # Mandatory skill missing - significantly reduce score
+                score -= 0.5 * weights[k]
+
+        scores[i] = max(score / total_weight, 0.0)
+
+    return scores
+
+# Columns of a score row, in _materialize_match_result argument order
+SCORE_COLUMNS = 7
+
+@njit(
+    'float64[:, :](int64[:], int32[:], uint8[:], int8[:], float64[:], float64[:], '
+    'int64, int64, int64, float64, float64, float64)',
+    parallel=True, cache=True
+)
+def component_rows(coach_idx, experience_years, day_masks, day_popcount, hourly_rates, rating_scores,
+                   required_years, request_day_mask, request_day_count, flexibility_bonus, max_rate,
+                   value_rate):
+    """Score rows with the non-skill sub-scores and day overlap filled in; a max_rate of 0 means no budget"""
+    n_coaches = coach_idx.shape[0]
+    rows = np.zeros((n_coaches, SCORE_COLUMNS))
+
+    for i in prange(n_coaches):
+        j = coach_idx[i]
+
+        # Full experience score once the requirement is met, partial credit otherwise
+        years = experience_years[j]
+        experience = 1.0 if years >= required_years else years / required_years
+
+        # Share of requested days the coach is available on, plus the flexibility bonus
+        if request_day_count == 0:
+            availability = 0.5
+            overlap = 0.0
+        else:
+            overlap_days = day_popcount[day_masks[j] & request_day_mask]
+            overlap = overlap_days / request_day_count
+            if day_masks[j] == 0:
+                # Coaches without any availability get a neutral score
+                availability = 0.5
+            elif overlap_days == 0:
+                availability = 0.0
+            else:
+                availability = min(overlap + flexibility_bonus, 1.0)
+
+        # Great value within 80% of budget, acceptable up to budget, then drop off by overage
+        rate = hourly_rates[j]
+        if max_rate == 0.0:
+            price = 0.5
+        elif rate <= value_rate:
+            price = 1.0
+        elif rate <= max_rate:
+            price = 0.8
+        else:
+            price = max(0.0, 0.5 - (rate - max_rate) / max_rate)
+
+        rows[i, 2] = experience
+        rows[i, 3] = availability
+        rows[i, 4] = price
+        # Rating scores do not depend on the request and are precomputed with the pool
+        rows[i, 5] = rating_scores[j]
+        rows[i, 6] = overlap
+
+    return rows
+
+@njit('void(float64[:, :], float64[:], float64[:])', parallel=True, cache=True)
+def complete_rows(rows, skill, weights):
+    """Fill in the skill and weighted overall score columns, capping the overall at 1.0"""
+    for i in prange(rows.shape[0]):
+        rows[i, 0] = min(
+            skill[i] * weights[0] +
+            rows[i, 2] * weights[1] +
+            rows[i, 3] * weights[2] +
+            rows[i, 4] * weights[3] +
+            rows[i, 5] * weights[4],
+            1.0
+        )
+        rows[i, 1] = skill[i]